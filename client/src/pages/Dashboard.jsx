@@ -28,7 +28,10 @@ const Dashboard = ({ onLogout }) => {
     wsRef.current.onmessage = (event) => {
       const data = JSON.parse(event.data);
       
-      if (data.type === 'event') {
+      if (data.type === 'tick') {
+        // One frame per tick carrying every event from that tick
+        setEvents(prev => [...data.events.slice().reverse(), ...prev].slice(0, 50));
+      } else if (data.type === 'event') {
         setEvents(prev => [data.data, ...prev].slice(0, 50));
       } else if (data.type === 'reasoning') {
         setReasoning(prev => [data.data, ...prev].slice(0, 50));
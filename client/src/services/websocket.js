@@ -93,6 +93,12 @@ class WebSocketService {
    * Handle incoming message
    */
   handleMessage(data) {
+    // Tick frames batch all events of a simulation tick; dispatch them individually
+    if (data.type === 'tick') {
+      (data.events || []).forEach((event) => this.handleMessage({ type: 'event', ...event }));
+      return;
+    }
+
     const { type, ... payload } = data;
 
     // Emit to specific type listeners
@@ -267,4 +267,4 @@ class BayesianNetwork:
         """Update a conditional probability table entry (for learning)"""
         if table_name in self.cpts and key in self.cpts[table_name]:
             self.cpts[table_name][key] = value
-            logger.info(f"CPT updated: {table_name}[{key}] = {value}")
\ No newline at end of file
+            logger.info("CPT updated: %s[%s] = %s", table_name, key, value)
\ No newline at end of file
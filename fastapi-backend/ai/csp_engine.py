@@ -73,7 +73,7 @@ class CSPEngine:
             )
             self.constraints.append(constraint)
         
-        logger.info(f"CSP initialized with {len(self.constraints)} power constraints")
+        logger.info("CSP initialized with %s power constraints", len(self.constraints))
     
     def _get_building_priority(self, building_type: BuildingType) -> Priority:
         """Determine building priority level"""
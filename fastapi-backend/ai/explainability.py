@@ -63,7 +63,7 @@ class XAIEngine:
             engine.value: 0 for engine in AIEngine
         }
         
-        logger.info(f"XAI Engine initialized (Enabled: {self.enabled}, Verbose: {self.verbose})")
+        logger.info("XAI Engine initialized (Enabled: %s, Verbose: %s)", self.enabled, self.verbose)
     
     def log_decision(
         self,
@@ -122,7 +122,7 @@ class XAIEngine:
             self.reasoning_traces = self.reasoning_traces[-1000:]
         
         if self.verbose:
-            logger.info(f"XAI: {engine.value.upper()} - {decision_type}: {explanation[:100]}...")
+            logger.info("XAI: %s - %s: %.100s...", engine.value.upper(), decision_type, explanation)
         
         return trace
     
@@ -63,7 +63,7 @@ class LogicEngine:
         # Initialize rules
         self._initialize_rules()
         
-        logger.info(f"Logic Engine initialized with {len(self.rules)} rules")
+        logger.info("Logic Engine initialized with %s rules", len(self.rules))
     
     def _initialize_rules(self):
         """Initialize all logic rules"""
@@ -211,16 +211,38 @@ class LogicEngine:
         Evaluate all rules against current state
         Returns list of triggered alerts
         """
+        vehicle_contexts = [self.build_vehicle_context(v, tick) for v in vehicles]
+        stuck_vehicles = sum(1 for v in vehicles if v.status == VehicleStatus.STUCK)
+        
+        return self.evaluate_pre_collected(tick, vehicle_contexts, stuck_vehicles)
+    
+    def evaluate_pre_collected(
+        self,
+        tick: int,
+        vehicle_contexts: List[Dict[str, Any]],
+        stuck_vehicles: int
+    ) -> List[Alert]:
+        """
+        Evaluate all rules against vehicle contexts gathered by the caller
+        Lets the simulation collect inputs during its own vehicle pass
+        
+        Args:
+            tick: Current tick
+            vehicle_contexts: One build_vehicle_context() dict per vehicle
+            stuck_vehicles: Number of vehicles currently stuck
+        
+        Returns:
+            List of triggered alerts
+        """
         new_alerts = []
         
         # Evaluate vehicle-specific rules
-        for vehicle in vehicles:
-            context = self._build_vehicle_context(vehicle, tick)
+        for context in vehicle_contexts:
             alerts = self._evaluate_rules(context, tick)
             new_alerts.extend(alerts)
         
         # Evaluate city-wide rules
-        city_context = self._build_city_context(tick, vehicles)
+        city_context = self._build_city_context(tick, stuck_vehicles, len(vehicle_contexts))
         city_alerts = self._evaluate_rules(city_context, tick)
         new_alerts.extend(city_alerts)
         
@@ -259,14 +281,14 @@ class LogicEngine:
                     # Update fire counts
                     self.rule_fire_counts[rule.id] = self.rule_fire_counts.get(rule.id, 0) + 1
                     
-                    logger.info(f"Rule {rule.id} ({rule.name}) fired: {message}")
+                    logger.info("Rule %s (%s) fired: %s", rule.id, rule.name, message)
             
             except Exception as e:
-                logger.error(f"Error evaluating rule {rule.id}: {e}")
+                logger.error("Error evaluating rule %s: %s", rule.id, e)
         
         return alerts
     
-    def _build_vehicle_context(self, vehicle: Vehicle, tick: int) -> Dict[str, Any]:
+    def build_vehicle_context(self, vehicle: Vehicle, tick: int) -> Dict[str, Any]:
         """Build context dictionary for vehicle"""
         return {
             "vehicle_id": vehicle.id,
@@ -280,7 +302,7 @@ class LogicEngine:
             "tick": tick
         }
     
-    def _build_city_context(self, tick: int, vehicles: List[Vehicle]) -> Dict[str, Any]:
+    def _build_city_context(self, tick: int, stuck_vehicles: int, total_vehicles: int) -> Dict[str, Any]:
         """Build context dictionary for city-wide state"""
         # Calculate power utilization
         total_demand = self.city.get_total_power_demand()
@@ -293,13 +315,13 @@ class LogicEngine:
         )
         
         # Count active emergencies
-        active_emergencies = sum(1 for e in self.city.emergencies if not e.resolved)
+        active_emergencies = len(self.city.active_emergencies)
         
         # Count blocked roads
         blocked_roads = len(self.city.blocked_roads)
         
         # Count affected vehicles
-        affected_vehicles = sum(1 for v in vehicles if v.status == VehicleStatus.STUCK)
+        affected_vehicles = stuck_vehicles
         
         return {
             "tick": tick,
@@ -310,7 +332,7 @@ class LogicEngine:
             "active_emergencies": active_emergencies,
             "blocked_roads": blocked_roads,
             "affected_vehicles": affected_vehicles,
-            "total_vehicles": len(vehicles)
+            "total_vehicles": total_vehicles
         }
     
     def get_recent_alerts(self, limit: int = 20) -> List[Alert]:
@@ -3,6 +3,7 @@ HTN Planner - Hierarchical Task Network for Emergency Response
 Plans complex multi-step missions for emergency vehicles
 """
 from typing import List, Optional, Dict, Any, Tuple
+import logging
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -175,7 +176,7 @@ class HTNPlanner:
             self._decompose_fire_response(root_task, vehicle, emergency)
         
         else:
-            logger.error(f"Unknown emergency type: {emergency.type}")
+            logger.error("Unknown emergency type: %s", emergency.type)
             return None
         
         # Create plan
@@ -189,8 +190,10 @@ class HTNPlanner:
         
         self.plans[plan_id] = plan
         
-        logger.info(f"HTN Plan created: {plan_id} for {emergency.type} emergency")
-        logger.debug(f"Plan tree:\n{plan.get_task_tree_string()}")
+        logger.info("HTN Plan created: %s for %s emergency", plan_id, emergency.type)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Rendering the tree is the costly part, so skip it when debug is filtered
+            logger.debug("Plan tree:\n%s", plan.get_task_tree_string())
 
         
         return plan
@@ -398,7 +401,7 @@ class HTNPlanner:
     def update_plan_status(self, plan_id: str, task_id: str, new_status: TaskStatus):
         """Update status of a specific task in a plan"""
         if plan_id not in self.plans:
-            logger.error(f"Plan {plan_id} not found")
+            logger.error("Plan %s not found", plan_id)
             return
         
         plan = self.plans[plan_id]
@@ -407,7 +410,7 @@ class HTNPlanner:
         for task in plan.get_all_tasks():
             if task.id == task_id:
                 task.status = new_status
-                logger.info(f"Task {task.name} status updated to {new_status.value}")
+                logger.info("Task %s status updated to %s", task.name, new_status.value)
                 break
     
     def get_plan(self, plan_id: str) -> Optional[Plan]:
@@ -54,11 +54,11 @@ class SearchEngine:
         """
         # Validate positions
         if not self.graph.is_valid_position(start):
-            logger.error(f"Invalid start position: {start}")
+            logger.error("Invalid start position: %s", start)
             return None
         
         if not self.graph.is_valid_position(goal):
-            logger.error(f"Invalid goal position: {goal}")
+            logger.error("Invalid goal position: %s", goal)
             return None
         
         # Select algorithm
@@ -69,7 +69,7 @@ class SearchEngine:
         elif algorithm.lower() == "bfs":
             path = self._bfs(start, goal)
         else:
-            logger.error(f"Unknown algorithm: {algorithm}")
+            logger.error("Unknown algorithm: %s", algorithm)
             return None
         
         # Update statistics
@@ -102,7 +102,7 @@ class SearchEngine:
             
             # Goal check
             if current_pos == goal:
-                logger.debug(f"A* found path: {len(current_path)} steps, {nodes_explored} nodes explored")
+                logger.debug("A* found path: %s steps, %s nodes explored", len(current_path), nodes_explored)
                 return current_path
             
             if current_pos in visited:
@@ -112,8 +112,8 @@ class SearchEngine:
             nodes_explored += 1
             
             # Expand neighbors
-            for neighbor in self.graph.get_neighbors(current_pos):
-                new_cost = cost_so_far[current_pos] + self.graph.get_cost(current_pos, neighbor)
+            for neighbor, step_cost in self.graph.get_weighted_neighbors(current_pos):
+                new_cost = cost_so_far[current_pos] + step_cost
                 
                 if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
                     cost_so_far[neighbor] = new_cost
@@ -121,7 +121,7 @@ class SearchEngine:
                     new_path = current_path + [neighbor]
                     heapq.heappush(frontier, PriorityNode(priority, neighbor, new_path))
         
-        logger.warning(f"A* failed to find path from {start} to {goal}")
+        logger.warning("A* failed to find path from %s to %s", start, goal)
         return None
     
     def _dijkstra(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
@@ -144,7 +144,7 @@ class SearchEngine:
             
             # Goal check
             if current_pos == goal:
-                logger.debug(f"Dijkstra found path: {len(current_path)} steps, {nodes_explored} nodes explored")
+                logger.debug("Dijkstra found path: %s steps, %s nodes explored", len(current_path), nodes_explored)
                 return current_path
             
             if current_pos in visited:
@@ -154,15 +154,15 @@ class SearchEngine:
             nodes_explored += 1
             
             # Expand neighbors
-            for neighbor in self.graph.get_neighbors(current_pos):
-                new_cost = cost_so_far[current_pos] + self.graph.get_cost(current_pos, neighbor)
+            for neighbor, step_cost in self.graph.get_weighted_neighbors(current_pos):
+                new_cost = cost_so_far[current_pos] + step_cost
                 
                 if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
                     cost_so_far[neighbor] = new_cost
                     new_path = current_path + [neighbor]
                     heapq.heappush(frontier, PriorityNode(new_cost, neighbor, new_path))
         
-        logger.warning(f"Dijkstra failed to find path from {start} to {goal}")
+        logger.warning("Dijkstra failed to find path from %s to %s", start, goal)
         return None
     
     def _bfs(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
@@ -181,7 +181,7 @@ class SearchEngine:
             
             # Goal check
             if current_pos == goal:
-                logger.debug(f"BFS found path: {len(current_path)} steps, {nodes_explored} nodes explored")
+                logger.debug("BFS found path: %s steps, %s nodes explored", len(current_path), nodes_explored)
                 return current_path
             
             # Expand neighbors
@@ -191,7 +191,7 @@ class SearchEngine:
                     new_path = current_path + [neighbor]
                     queue.append((neighbor, new_path))
         
-        logger.warning(f"BFS failed to find path from {start} to {goal}")
+        logger.warning("BFS failed to find path from %s to %s", start, goal)
         return None
     
     def _update_avg_path_length(self, algorithm: str, path_length: int):
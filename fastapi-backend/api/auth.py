@@ -7,19 +7,17 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, timedelta
 from typing import Optional
-import jwt
-from passlib.context import CryptContext
 
-from utils.config import settings
 from utils.logger import setup_logger
+from utils.security import (
+    hash_password_async, verify_password_async, verify_token, forget_password_verifications,
+    needs_rehash, create_token
+)
 
 logger = setup_logger(__name__)
 
 router = APIRouter()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
@@ -53,28 +51,9 @@ class User(BaseModel):
 
 
 # Utility Functions
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    """Create JWT access token"""
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None, *, _copy: bool = True):
+    """Create JWT access token (pass _copy=False for a freshly built dict)"""
+    return create_token(data, expires_delta, _copy=_copy)
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
@@ -85,14 +64,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except jwt.PyJWTError:
+    # Signature check only (cached per token); no password hashing on this path
+    claims = verify_token(token)
+    if claims is None:
         raise credentials_exception
     
+    username: str = claims.sub
+    
     user = users_db.get(username)
     if user is None:
         raise credentials_exception
@@ -119,7 +97,7 @@ async def signup(user_data: UserSignup):
         )
     
     # Create user
-    hashed_pw = hash_password(user_data.password)
+    hashed_pw = await hash_password_async(user_data.password)
     users_db[user_data.username] = {
         "username": user_data.username,
         "email": user_data.email,
@@ -128,10 +106,10 @@ async def signup(user_data: UserSignup):
         "created_at": datetime.utcnow()
     }
     
-    logger.info(f"New user registered: {user_data.username}")
+    logger.info("New user registered: %s", user_data.username)
     
     # Generate token
-    access_token = create_access_token(data={"sub": user_data.username})
+    access_token = create_access_token(data={"sub": user_data.username}, _copy=False)
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -141,17 +119,21 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Authenticate user and return JWT token"""
     user = users_db.get(form_data.username)
     
-    if not user or not verify_password(form_data.password, user["hashed_password"]):
+    if not user or not await verify_password_async(form_data.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    logger.info(f"User logged in: {form_data.username}")
+    # Upgrade legacy (e.g. bcrypt) or outdated hashes while the plain password is at hand
+    if needs_rehash(user["hashed_password"]):
+        user["hashed_password"] = await hash_password_async(form_data.password)
+    
+    logger.info("User logged in: %s", form_data.username)
     
     # Generate token
-    access_token = create_access_token(data={"sub": form_data.username})
+    access_token = create_access_token(data={"sub": form_data.username}, _copy=False)
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -165,5 +147,11 @@ async def get_me(current_user: User = Depends(get_current_user)):
 @router.post("/logout")
 async def logout(current_user: User = Depends(get_current_user)):
     """Logout endpoint (client should delete token)"""
-    logger.info(f"User logged out: {current_user.username}")
+    logger.info("User logged out: %s", current_user.username)
+    
+    # Cached password checks must not outlive the session
+    user = users_db.get(current_user.username)
+    if user:
+        forget_password_verifications(user["hashed_password"])
+    
     return {"message": "Successfully logged out"}
\ No newline at end of file
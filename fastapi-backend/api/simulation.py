@@ -1,6 +1,9 @@
 """
 Simulation Control API Endpoints
 Start, pause, restart, and configure simulation
+
+Control handlers are plain def so they take sim_service.lock in Starlette's
+threadpool rather than on the event loop.
 """
 from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
@@ -27,7 +30,7 @@ class SimulationResponse(BaseModel):
 
 
 @router.post("/start", response_model=SimulationResponse)
-async def start_simulation(
+def start_simulation(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
@@ -39,7 +42,7 @@ async def start_simulation(
     
     sim_service.start()
     
-    logger.info(f"Simulation started by user:  {current_user.username}")
+    logger.info("Simulation started by user: %s", current_user.username)
     
     return SimulationResponse(
         status="running",
@@ -49,7 +52,7 @@ async def start_simulation(
 
 
 @router.post("/pause", response_model=SimulationResponse)
-async def pause_simulation(
+def pause_simulation(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
@@ -61,7 +64,7 @@ async def pause_simulation(
     
     sim_service.pause()
     
-    logger.info(f"Simulation paused by user: {current_user.username}")
+    logger.info("Simulation paused by user: %s", current_user.username)
     
     return SimulationResponse(
         status="paused",
@@ -71,7 +74,7 @@ async def pause_simulation(
 
 
 @router.post("/restart", response_model=SimulationResponse)
-async def restart_simulation(
+def restart_simulation(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
@@ -83,7 +86,7 @@ async def restart_simulation(
     
     sim_service.restart()
     
-    logger.info(f"Simulation restarted by user: {current_user.username}")
+    logger.info("Simulation restarted by user: %s", current_user.username)
     
     return SimulationResponse(
         status="running",
@@ -93,7 +96,7 @@ async def restart_simulation(
 
 
 @router.post("/weather")
-async def set_weather(
+def set_weather(
     weather_request: WeatherRequest,
     request: Request,
     current_user: User = Depends(get_current_user)
@@ -113,7 +116,7 @@ async def set_weather(
     
     sim_service.set_weather(weather_request.weather. lower())
     
-    logger.info(f"Weather changed to {weather_request.weather} by user: {current_user. username}")
+    logger.info("Weather changed to %s by user: %s", weather_request.weather, current_user.username)
     
     return {
         "weather": weather_request.weather. lower(),
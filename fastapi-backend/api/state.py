@@ -1,8 +1,12 @@
 """
 State Query API Endpoints
 Retrieve city state, vehicles, buildings, events, and metrics
+
+Handlers are plain def so Starlette runs them in its threadpool; waiting on
+sim_service.lock while a tick holds it then never stalls the event loop.
 """
 from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 
 from api.auth import get_current_user, User
@@ -14,7 +18,7 @@ router = APIRouter()
 
 
 @router.get("/city")
-async def get_city_state(
+def get_city_state(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
@@ -28,7 +32,7 @@ async def get_city_state(
 
 
 @router.get("/vehicles")
-async def get_vehicles(
+def get_vehicles(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
@@ -38,11 +42,12 @@ async def get_vehicles(
     if not sim_service:
         raise HTTPException(status_code=500, detail="Simulation service not initialized")
     
-    return [v.get_state_dict() for v in sim_service.vehicles]
+    with sim_service.lock:
+        return [v.get_state_dict() for v in sim_service.vehicles]
 
 
 @router.get("/buildings")
-async def get_buildings(
+def get_buildings(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
@@ -52,21 +57,22 @@ async def get_buildings(
     if not sim_service:
         raise HTTPException(status_code=500, detail="Simulation service not initialized")
     
-    return [
-        {
-            "id": b.id,
-            "type": b.type. value,
-            "position": {"x": b.position[0], "y": b.position[1]},
-            "power_requirement": b.power_requirement,
-            "allocated_power": b.allocated_power,
-            "color": b.color
-        }
-        for b in sim_service.city.buildings
-    ]
+    with sim_service.lock:
+        return [
+            {
+                "id": b.id,
+                "type": b.type. value,
+                "position": {"x": b.position[0], "y": b.position[1]},
+                "power_requirement": b.power_requirement,
+                "allocated_power": b.allocated_power,
+                "color": b.color
+            }
+            for b in sim_service.city.buildings
+        ]
 
 
 @router.get("/emergencies")
-async def get_emergencies(
+def get_emergencies(
     request: Request,
     include_resolved: bool = Query(False, description="Include resolved emergencies"),
     current_user: User = Depends(get_current_user)
@@ -77,27 +83,28 @@ async def get_emergencies(
     if not sim_service:
         raise HTTPException(status_code=500, detail="Simulation service not initialized")
     
-    emergencies = sim_service.city.emergencies
-    
-    if not include_resolved:
-        emergencies = [e for e in emergencies if not e. resolved]
-    
-    return [
-        {
-            "id":  e.id,
-            "type": e.type,
-            "position": {"x":  e.position[0], "y": e.position[1]},
-            "severity": e.severity,
-            "created_tick": e.created_tick,
-            "assigned_vehicle": e.assigned_vehicle_id,
-            "resolved":  e.resolved
-        }
-        for e in emergencies
-    ]
+    with sim_service.lock:
+        emergencies = sim_service.city.emergencies
+        
+        if not include_resolved:
+            emergencies = [e for e in emergencies if not e. resolved]
+        
+        return [
+            {
+                "id":  e.id,
+                "type": e.type,
+                "position": {"x":  e.position[0], "y": e.position[1]},
+                "severity": e.severity,
+                "created_tick": e.created_tick,
+                "assigned_vehicle": e.assigned_vehicle_id,
+                "resolved":  e.resolved
+            }
+            for e in emergencies
+        ]
 
 
 @router.get("/events")
-async def get_events(
+def get_events(
     request: Request,
     limit: int = Query(50, ge=1, le=200, description="Maximum number of events"),
     current_user: User = Depends(get_current_user)
@@ -109,13 +116,15 @@ async def get_events(
         raise HTTPException(status_code=500, detail="Simulation service not initialized")
     
     # Get events from event bus
-    events = sim_service. event_bus.get_recent_events(limit=limit)
+    with sim_service.lock:
+        events = sim_service.event_bus.get_recent_events(limit=limit)
+        payload = [event.to_orjson_dict() for event in events]
     
-    return [event.to_dict() for event in events]
+    return ORJSONResponse(payload)
 
 
 @router.get("/reasoning")
-async def get_reasoning(
+def get_reasoning(
     request: Request,
     limit: int = Query(50, ge=1, le=200, description="Maximum number of logs"),
     engine:  Optional[str] = Query(None, description="Filter by engine"),
@@ -137,7 +146,8 @@ async def get_reasoning(
         except ValueError:
             pass
     
-    traces = sim_service.xai_engine.get_recent_traces(limit=limit, engine=engine_filter)
+    with sim_service.lock:
+        traces = sim_service.xai_engine.get_recent_traces(limit=limit, engine=engine_filter)
     
     return [
         {
@@ -157,7 +167,7 @@ async def get_reasoning(
 
 
 @router.get("/metrics")
-async def get_metrics(
+def get_metrics(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
@@ -171,7 +181,7 @@ async def get_metrics(
 
 
 @router.get("/power")
-async def get_power_allocation(
+def get_power_allocation(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
@@ -181,8 +191,9 @@ async def get_power_allocation(
     if not sim_service:
         raise HTTPException(status_code=500, detail="Simulation service not initialized")
     
-    summary = sim_service.csp_engine.get_allocation_summary()
-    allocation = sim_service.csp_engine.last_allocation
+    with sim_service.lock:
+        summary = sim_service.csp_engine.get_allocation_summary()
+        allocation = dict(sim_service.csp_engine.last_allocation)
     
     return {
         **summary,
@@ -191,7 +202,7 @@ async def get_power_allocation(
 
 
 @router.get("/ai/stats")
-async def get_ai_stats(
+def get_ai_stats(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
@@ -201,10 +212,11 @@ async def get_ai_stats(
     if not sim_service:
         raise HTTPException(status_code=500, detail="Simulation service not initialized")
     
-    return {
-        "search":  sim_service.search_engine.get_stats(),
-        "csp":  sim_service.csp_engine.get_allocation_summary(),
-        "logic": sim_service.logic_engine.get_rule_statistics(),
-        "bayesian": sim_service.bayesian_network.get_network_state(),
-        "xai": sim_service.xai_engine.get_statistics()
-    }
\ No newline at end of file
+    with sim_service.lock:
+        return {
+            "search":  sim_service.search_engine.get_stats(),
+            "csp":  sim_service.csp_engine.get_allocation_summary(),
+            "logic": sim_service.logic_engine.get_rule_statistics(),
+            "bayesian": sim_service.bayesian_network.get_network_state(),
+            "xai": sim_service.xai_engine.get_statistics()
+        }
\ No newline at end of file
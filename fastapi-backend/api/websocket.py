@@ -28,20 +28,20 @@ class ConnectionManager:
         await websocket.accept()
         self.active_connections.add(websocket)
         self.connection_count += 1
-        logger.info(f"WebSocket connected.  Total:  {len(self.active_connections)}")
+        logger.info("WebSocket connected. Total: %s", len(self.active_connections))
     
     def disconnect(self, websocket: WebSocket):
         """Remove a connection"""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
-            logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
+            logger.info("WebSocket disconnected. Total: %s", len(self.active_connections))
     
     async def send_personal(self, message: dict, websocket: WebSocket):
         """Send message to specific client"""
         try:
             await websocket.send_json(message)
         except Exception as e:
-            logger.error(f"Error sending to WebSocket: {e}")
+            logger.error("Error sending to WebSocket: %s", e)
             self.disconnect(websocket)
     
     async def broadcast(self, message: dict):
@@ -52,7 +52,7 @@ class ConnectionManager:
             try:
                 await connection. send_json(message)
             except Exception as e:
-                logger.error(f"Broadcast error: {e}")
+                logger.error("Broadcast error: %s", e)
                 disconnected.add(connection)
         
         # Remove disconnected clients
@@ -111,17 +111,17 @@ async def websocket_endpoint(websocket: WebSocket):
                 
                 elif message_type == "subscribe":
                     # Handle subscription requests
-                    logger.debug(f"Subscription request: {message. get('data')}")
+                    logger.debug("Subscription request: %s", message.get('data'))
                 
                 else:
-                    logger.debug(f"Received message: {message_type}")
+                    logger.debug("Received message: %s", message_type)
             
             except json.JSONDecodeError:
-                logger.warning(f"Invalid JSON received: {data[: 100]}")
+                logger.warning("Invalid JSON received: %.100s", data)
     
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     
     except Exception as e: 
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         manager.disconnect(websocket)
\ No newline at end of file
@@ -2,7 +2,7 @@
 Vehicle Agent Base Class
 Represents smart cars and emergency vehicles in the simulation
 """
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 import random
@@ -53,11 +53,32 @@ class Vehicle:
     is_emergency: bool = False
     active_mission: Optional[str] = None  # Emergency ID
     
+    # Serialization cache (rebuilt only when state changed since last call)
+    _dirty: bool = field(default=True, init=False, repr=False, compare=False)
+    _last_state_dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Optional hook called as on_status_change(old_status, new_status)
+    on_status_change: Optional[Callable[[VehicleStatus, VehicleStatus], None]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
     def __post_init__(self):
         self.is_emergency = self.type in [VehicleType.AMBULANCE, VehicleType.FIRE_TRUCK]
     
+    def set_status(self, status: VehicleStatus):
+        """Change status and notify the status hook on actual transitions"""
+        old_status = self.status
+        if status == old_status:
+            return
+        
+        self.status = status
+        if self.on_status_change:
+            self.on_status_change(old_status, status)
+    
     def update(self, tick: int):
         """Update vehicle state each tick"""
+        previous_energy = self.energy
+        
         # Drain energy while moving
         if self.status == VehicleStatus.MOVING:
             self.energy = max(0, self.energy - 0.1)
@@ -66,21 +87,27 @@ class Vehicle:
         if self.status == VehicleStatus.IDLE:
             self.energy = min(100, self.energy + 0.2)
         
+        if self.energy != previous_energy:
+            self._dirty = True
+        
         # Check for low energy
         if self.energy < 25 and self.status != VehicleStatus.CHARGING:
-            logger.warning(f"Vehicle {self.id} low on energy: {self.energy:.1f}%")
+            logger.warning("Vehicle %s low on energy: %.1f%%", self.id, self.energy)
         
         # Random health degradation (wear and tear)
         if random.random() < 0.001:  # 0.1% chance per tick
             self.health = max(0, self.health - random.uniform(1, 5))
+            self._dirty = True
     
     def move_along_path(self) -> bool:
         """
         Move one step along the path
         Returns True if reached destination, False otherwise
         """
+        self._dirty = True
+        
         if not self.path:
-            self.status = VehicleStatus.IDLE
+            self.set_status(VehicleStatus.IDLE)
             return True
         
         # Get next position
@@ -90,12 +117,12 @@ class Vehicle:
         self.position = next_pos
         self.path.pop(0)
         
-        self.status = VehicleStatus.MOVING
+        self.set_status(VehicleStatus.MOVING)
         self.stuck_counter = 0
         
         # Check if reached destination
         if not self.path:
-            self.status = VehicleStatus.IDLE
+            self.set_status(VehicleStatus.IDLE)
             self.destination = None
             return True
         
@@ -103,31 +130,34 @@ class Vehicle:
     
     def set_path(self, path: List[Tuple[int, int]]):
         """Set new navigation path"""
+        self._dirty = True
         self.path = path
         if path:
             self.destination = path[-1]
-            self.status = VehicleStatus.MOVING
-            logger.debug(f"Vehicle {self.id} path set: {len(path)} steps")
+            self.set_status(VehicleStatus.MOVING)
+            logger.debug("Vehicle %s path set: %s steps", self.id, len(path))
         else:
-            logger.warning(f"Vehicle {self.id} received empty path")
+            logger.warning("Vehicle %s received empty path", self.id)
     
     def assign_mission(self, emergency_id: str, destination: Tuple[int, int]):
         """Assign emergency mission (for emergency vehicles)"""
         if not self.is_emergency:
-            logger.error(f"Cannot assign mission to non-emergency vehicle {self.id}")
+            logger.error("Cannot assign mission to non-emergency vehicle %s", self.id)
             return
         
+        self._dirty = True
         self.active_mission = emergency_id
         self.destination = destination
-        self.status = VehicleStatus.RESPONDING
-        logger.info(f"Emergency vehicle {self.id} assigned to {emergency_id}")
+        self.set_status(VehicleStatus.RESPONDING)
+        logger.info("Emergency vehicle %s assigned to %s", self.id, emergency_id)
     
     def complete_mission(self):
         """Complete current mission"""
         if self.active_mission:
-            logger.info(f"Emergency vehicle {self.id} completed mission {self.active_mission}")
+            logger.info("Emergency vehicle %s completed mission %s", self.id, self.active_mission)
+            self._dirty = True
             self.active_mission = None
-            self.status = VehicleStatus.IDLE
+            self.set_status(VehicleStatus.IDLE)
     
     def is_stuck(self) -> bool:
         """Check if vehicle is stuck (blocked path)"""
@@ -136,13 +166,21 @@ class Vehicle:
     def increment_stuck(self):
         """Increment stuck counter when unable to move"""
         self.stuck_counter += 1
+        self._dirty = True
         if self.stuck_counter > 5:
-            self.status = VehicleStatus.STUCK
-            logger.warning(f"Vehicle {self.id} is stuck at {self.position}")
+            self.set_status(VehicleStatus.STUCK)
+            logger.warning("Vehicle %s is stuck at %s", self.id, self.position)
     
     def get_state_dict(self) -> dict:
-        """Get vehicle state as dictionary for API/WebSocket"""
-        return {
+        """
+        Get vehicle state as dictionary for API/WebSocket
+        Returns a fresh top-level dict over the cached one; nested position/path
+        values are shared with the cache and must be treated as read-only
+        """
+        if not self._dirty and self._last_state_dict is not None:
+            return dict(self._last_state_dict)
+        
+        self._last_state_dict = {
             "id": self.id,
             "type": self.type.value,
             "position": {"x": self.position[0], "y": self.position[1]},
@@ -155,6 +193,8 @@ class Vehicle:
             "active_mission": self.active_mission,
             "status": self.status.value
         }
+        self._dirty = False
+        return dict(self._last_state_dict)
 
 
 def create_vehicle(vehicle_id: str, vehicle_type: VehicleType, start_pos: Tuple[int, int]) -> Vehicle:
@@ -82,6 +82,8 @@ class City:
         self.grid: List[List[CellType]] = []
         self.buildings: List[Building] = []
         self.emergencies: List[Emergency] = []
+        self.emergency_index: Dict[str, Emergency] = {}  # emergency id -> emergency
+        self.active_emergencies: Dict[str, Emergency] = {}  # unresolved only, in spawn order
         self.blocked_roads: Set[Tuple[int, int]] = set()
         self.weather: Weather = Weather.CLEAR
         
@@ -92,7 +94,7 @@ class City:
         # Initialize city
         self._generate_city()
         
-        logger.info(f"City initialized: {self.size}x{self.size} grid, {len(self.buildings)} buildings")
+        logger.info("City initialized: %sx%s grid, %s buildings", self.size, self.size, len(self.buildings))
     
     def _generate_city(self):
         """Generate procedural city layout"""
@@ -216,7 +218,9 @@ class City:
                     created_tick=tick
                 )
                 self.emergencies.append(emergency)
-                logger.warning(f"Emergency spawned: {emergency_type} at {(x, y)}")
+                self.emergency_index[emergency.id] = emergency
+                self.active_emergencies[emergency.id] = emergency
+                logger.warning("Emergency spawned: %s at %s", emergency_type, (x, y))
                 return emergency
             attempts += 1
         
@@ -225,13 +229,13 @@ class City:
     def block_road(self, position: Tuple[int, int]):
         """Block a road (e.g., due to accident)"""
         self.blocked_roads.add(position)
-        logger.info(f"Road blocked at {position}")
+        logger.info("Road blocked at %s", position)
     
     def unblock_road(self, position: Tuple[int, int]):
         """Unblock a road"""
         if position in self.blocked_roads:
             self.blocked_roads.remove(position)
-            logger.info(f"Road unblocked at {position}")
+            logger.info("Road unblocked at %s", position)
     
     def set_weather(self, weather: str):
         """Change weather conditions"""
@@ -241,7 +245,7 @@ class City:
             "snow": Weather.SNOW
         }
         self.weather = weather_map.get(weather.lower(), Weather.CLEAR)
-        logger.info(f"Weather changed to {self.weather.value}")
+        logger.info("Weather changed to %s", self.weather.value)
     
     def get_weather_modifier(self) -> float:
         """Get accident probability modifier based on weather"""
@@ -254,14 +258,14 @@ class City:
     
     def resolve_emergency(self, emergency_id: str):
         """Mark emergency as resolved"""
-        for emergency in self.emergencies:
-            if emergency.id == emergency_id:
-                emergency.resolved = True
-                # Unblock road if it was an accident
-                if emergency.type == "accident":
-                    self.unblock_road(emergency.position)
-                logger.info(f"Emergency resolved: {emergency_id}")
-                break
+        emergency = self.emergency_index.get(emergency_id)
+        if emergency:
+            emergency.resolved = True
+            self.active_emergencies.pop(emergency_id, None)
+            # Unblock road if it was an accident
+            if emergency.type == "accident":
+                self.unblock_road(emergency.position)
+            logger.info("Emergency resolved: %s", emergency_id)
     
     def get_total_power_demand(self) -> int:
         """Calculate total power demand from all buildings"""
@@ -2,11 +2,14 @@
 Event Bus System for Simulation
 Handles event dispatching and subscription
 """
-from typing import List, Dict, Callable, Any, Optional
+from typing import List, Dict, Callable, Any, Optional, Set
 from dataclasses import dataclass, field
+from collections import deque, defaultdict
 from datetime import datetime
 from enum import Enum
-import uuid
+import asyncio
+import inspect
+import itertools
 
 from utils.logger import setup_logger
 
@@ -46,10 +49,14 @@ class EventType(Enum):
     AI_ALERT = "ai_alert"
 
 
-@dataclass
+# Process-wide event id sequence (next() on itertools.count is atomic under the GIL)
+_event_ids = itertools.count(1)
+
+
+@dataclass(slots=True)
 class Event: 
     """Represents a simulation event"""
-    id:  str = field(default_factory=lambda:  str(uuid.uuid4())[:8])
+    id:  str = field(default_factory=lambda: str(next(_event_ids)))
     type: EventType = EventType.SIMULATION_TICK
     tick: int = 0
     timestamp: datetime = field(default_factory=datetime.utcnow)
@@ -58,30 +65,72 @@ class Event:
     severity: str = "info"  # info, warning, critical
     data: Dict[str, Any] = field(default_factory=dict)
     
+    # Serialization caches
+    _type_value: str = field(default="", init=False, repr=False, compare=False)
+    _iso_timestamp: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._type_value = self.type.value
+    
     def to_dict(self) -> dict:
         """Convert event to dictionary"""
+        if self._iso_timestamp is None:
+            self._iso_timestamp = self.timestamp.isoformat()
+        
         return {
             "id": self.id,
-            "type": self.type.value,
+            "type": self._type_value,
             "tick": self. tick,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self._iso_timestamp,
             "title": self.title,
             "description": self.description,
             "severity": self. severity,
             "data": self.data
         }
+    
+    def to_orjson_dict(self) -> dict:
+        """Convert event to dictionary for orjson (datetime left for its native encoder)"""
+        return {
+            "id": self.id,
+            "type": self._type_value,
+            "tick": self.tick,
+            "timestamp": self.timestamp,
+            "title": self.title,
+            "description": self.description,
+            "severity": self.severity,
+            "data": self.data
+        }
 
 
 class EventBus:
     """
     Central event bus for simulation
     Allows components to publish and subscribe to events
+    
+    Sync callbacks run inline during publish; coroutine callbacks are
+    scheduled as tasks so slow subscribers never block the tick.
+    
+    publish() must only be called from the simulation tick thread. Other
+    threads (API handlers) use publish_external(), which enqueues the event
+    for the tick thread to dispatch via drain_external().
     """
     
     def __init__(self):
         self.subscribers: Dict[EventType, List[Callable]] = {}
-        self.event_history: List[Event] = []
+        self.async_subscribers: Dict[EventType, List[Callable]] = {}
         self.max_history = 500
+        self.event_history: deque = deque(maxlen=self.max_history)
+        self._history_by_type: Dict[EventType, deque] = defaultdict(
+            lambda: deque(maxlen=self.max_history)
+        )
+        
+        # Async deliveries published while no event loop was running
+        self._pending_async: deque = deque()
+        self._async_tasks: Set[asyncio.Task] = set()
+        
+        # Events published from other threads, drained by the tick thread.
+        # deque.append/popleft are atomic, so producers never take a lock.
+        self._inbox: deque = deque()
         
         logger.info("EventBus initialized")
     
@@ -91,20 +140,26 @@ class EventBus:
         
         Args:
             event_type: Type of event to subscribe to
-            callback: Function to call when event occurs
+            callback: Function or coroutine function to call when event occurs
         """
-        if event_type not in self.subscribers:
-            self. subscribers[event_type] = []
+        if inspect.iscoroutinefunction(callback):
+            registry = self.async_subscribers
+        else:
+            registry = self.subscribers
         
-        self.subscribers[event_type].append(callback)
-        logger.debug(f"Subscriber added for {event_type.value}")
+        if event_type not in registry:
+            registry[event_type] = []
+        
+        registry[event_type].append(callback)
+        logger.debug("Subscriber added for %s", event_type.value)
     
     def unsubscribe(self, event_type: EventType, callback:  Callable):
         """Remove a subscriber"""
-        if event_type in self.subscribers:
-            self.subscribers[event_type] = [
-                cb for cb in self.subscribers[event_type] if cb != callback
-            ]
+        for registry in (self.subscribers, self.async_subscribers):
+            if event_type in registry:
+                registry[event_type] = [
+                    cb for cb in registry[event_type] if cb != callback
+                ]
     
     def publish(self, event: Event):
         """
@@ -115,8 +170,7 @@ class EventBus:
         """
         # Store in history
         self.event_history.append(event)
-        if len(self.event_history) > self.max_history:
-            self.event_history = self.event_history[-self. max_history:]
+        self._history_by_type[event.type].append(event)
         
         # Notify subscribers
         if event.type in self.subscribers:
@@ -124,12 +178,63 @@ class EventBus:
                 try:
                     callback(event)
                 except Exception as e: 
-                    logger.error(f"Error in event subscriber: {e}")
+                    logger.error("Error in event subscriber: %s", e)
+        
+        # Schedule async subscribers without waiting on them
+        if event.type in self.async_subscribers:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            
+            for callback in self.async_subscribers[event.type]:
+                if loop:
+                    self._schedule_async(loop, callback, event)
+                else:
+                    self._pending_async.append((callback, event))
         
         # Also notify wildcard subscribers (if any)
         if EventType.SIMULATION_TICK in self.subscribers and event.type != EventType.SIMULATION_TICK:
             pass  # Tick events handled separately
     
+    def publish_external(self, event: Event):
+        """
+        Queue an event published from outside the tick thread
+        
+        Args:
+            event: Event to publish on the next drain_external()
+        """
+        self._inbox.append(event)
+    
+    def drain_external(self):
+        """Publish all queued external events (call from the tick thread)"""
+        inbox = self._inbox
+        while inbox:
+            self.publish(inbox.popleft())
+    
+    def dispatch_pending_async(self):
+        """
+        Schedule async deliveries queued while no event loop was running
+        Must be called from within the event loop
+        """
+        loop = asyncio.get_running_loop()
+        while self._pending_async:
+            callback, event = self._pending_async.popleft()
+            self._schedule_async(loop, callback, event)
+    
+    def _schedule_async(self, loop: asyncio.AbstractEventLoop, callback: Callable, event: Event):
+        """Create a task for an async subscriber and keep a reference until done"""
+        task = loop.create_task(self._run_async_subscriber(callback, event))
+        self._async_tasks.add(task)
+        task.add_done_callback(self._async_tasks.discard)
+    
+    async def _run_async_subscriber(self, callback: Callable, event: Event):
+        """Run an async subscriber, logging instead of propagating errors"""
+        try:
+            await callback(event)
+        except Exception as e:
+            logger.error("Error in async event subscriber: %s", e)
+    
     def create_and_publish(
         self,
         event_type: EventType,
@@ -137,11 +242,15 @@ class EventBus:
         title: str,
         description: str,
         severity: str = "info",
-        data: Dict[str, Any] = None
+        data: Dict[str, Any] = None,
+        external: bool = False
     ) -> Event:
         """
         Create and publish an event in one call
         
+        Args:
+            external: Queue via publish_external() instead of dispatching inline
+        
         Returns:
             The created event
         """
@@ -154,17 +263,25 @@ class EventBus:
             data=data or {}
         )
         
-        self.publish(event)
+        if external:
+            self.publish_external(event)
+        else:
+            self.publish(event)
         return event
     
     def get_recent_events(self, limit: int = 50, event_type: Optional[EventType] = None) -> List[Event]:
         """Get recent events, optionally filtered by type"""
-        if event_type:
-            filtered = [e for e in self. event_history if e.type == event_type]
-            return filtered[-limit:]
-        return self.event_history[-limit:]
+        history = self._history_by_type.get(event_type) if event_type else self.event_history
+        if not history or limit <= 0:
+            return []
+        
+        # Walk from the newest end so cost is O(limit), not O(history)
+        recent = list(itertools.islice(reversed(history), limit))
+        recent.reverse()
+        return recent
     
     def clear_history(self):
         """Clear event history"""
-        self.event_history = []
+        self.event_history.clear()
+        self._history_by_type.clear()
         logger.info("Event history cleared")
\ No newline at end of file
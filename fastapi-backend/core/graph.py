@@ -3,17 +3,39 @@ Grid Graph for Pathfinding
 Provides adjacency structure for A*, Dijkstra, and BFS algorithms
 """
 from typing import List, Tuple, Set, Dict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from core.city import City
+import numpy as np
 
+from core.city import City, CellType
 
-@dataclass
+
+# Movement directions as (dx, dy)
+CARDINAL_DIRECTIONS = [
+    (0, -1),  # North
+    (1, 0),   # East
+    (0, 1),   # South
+    (-1, 0),  # West
+]
+
+DIAGONAL_DIRECTIONS = [
+    (-1, -1), # NW
+    (1, -1),  # NE
+    (1, 1),   # SE
+    (-1, 1),  # SW
+]
+
+# Base step cost per direction index (diagonals cost sqrt(2))
+DIRECTION_COSTS = (1.0, 1.0, 1.0, 1.0, 1.414, 1.414, 1.414, 1.414)
+
+
+@dataclass(slots=True)
 class Node:
     """Graph node representing a grid position"""
     position: Tuple[int, int]
     neighbors: List[Tuple[int, int]]
     cost: float = 1.0  # Base movement cost
+    neighbor_dirs: List[int] = field(default_factory=list)  # Direction index per neighbor
 
 
 class GridGraph:
@@ -21,50 +43,55 @@ class GridGraph:
     Graph representation of the city grid
     Supports 4-directional movement (N, S, E, W)
     Optionally supports 8-directional with diagonals
+    
+    Adjacency is built from static terrain; blocked roads are filtered
+    at query time so road blocks never require a rebuild.
     """
     
     def __init__(self, city: City, allow_diagonals: bool = False):
         self.city = city
         self.size = city.size
         self.allow_diagonals = allow_diagonals
+        self.directions = CARDINAL_DIRECTIONS + (DIAGONAL_DIRECTIONS if allow_diagonals else [])
         self.nodes: Dict[Tuple[int, int], Node] = {}
         
         # Build graph
         self._build_graph()
     
     def _build_graph(self):
-        """Build graph from city grid"""
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.city.is_walkable(x, y):
-                    neighbors = self._get_neighbors(x, y)
-                    self.nodes[(x, y)] = Node(
-                        position=(x, y),
-                        neighbors=neighbors
-                    )
+        """Build graph from city grid using vectorized neighbor masks"""
+        grid = np.array(self.city.grid, dtype=object)
+        terrain = (grid == CellType.ROAD) | (grid == CellType.PARK)
+        
+        self.nodes = {}
+        ys, xs = np.nonzero(terrain)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.nodes[(x, y)] = Node(position=(x, y), neighbors=[])
+        
+        # One mask per direction marks every cell that can move that way; walking the
+        # directions in order keeps each node's neighbors in direction-index order
+        nodes = self.nodes
+        for i, (dx, dy) in enumerate(self.directions):
+            ys, xs = np.nonzero(terrain & self._shift(terrain, dx, dy))
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                node = nodes[(x, y)]
+                node.neighbors.append((x + dx, y + dy))
+                node.neighbor_dirs.append(i)
+    
+    @staticmethod
+    def _shift(mask: np.ndarray, dx: int, dy: int) -> np.ndarray:
+        """Return array where result[y, x] = mask[y + dy, x + dx] (False outside the grid)"""
+        height, width = mask.shape
+        shifted = np.zeros_like(mask)
+        shifted[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)] = \
+            mask[max(0, dy):height - max(0, -dy), max(0, dx):width - max(0, -dx)]
+        return shifted
     
     def _get_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
         """Get valid neighboring positions"""
         neighbors = []
         
-        # 4-directional movement
-        directions = [
-            (0, -1),  # North
-            (1, 0),   # East
-            (0, 1),   # South
-            (-1, 0),  # West
-        ]
-        
-        # Add diagonals if enabled
-        if self.allow_diagonals:
-            directions.extend([
-                (-1, -1), # NW
-                (1, -1),  # NE
-                (1, 1),   # SE
-                (-1, 1),  # SW
-            ])
-        
-        for dx, dy in directions:
+        for dx, dy in self.directions:
             nx, ny = x + dx, y + dy
             if self.city.is_walkable(nx, ny):
                 neighbors.append((nx, ny))
@@ -72,11 +99,35 @@ class GridGraph:
         return neighbors
     
     def get_neighbors(self, position: Tuple[int, int]) -> List[Tuple[int, int]]:
-        """Get neighbors for a position (updates dynamically based on blocked roads)"""
-        x, y = position
+        """
+        Get neighbors for a position (updates dynamically based on blocked roads)
+        With no roads blocked this is the node's own adjacency list, shared by every
+        caller; iterate it but never modify it
+        """
+        node = self.nodes.get(position)
+        if node is None:
+            return self._get_neighbors(*position)
+        
+        blocked = self.city.blocked_roads
+        if not blocked:
+            return node.neighbors
+        return [p for p in node.neighbors if p not in blocked]
+    
+    def get_weighted_neighbors(self, position: Tuple[int, int]) -> List[Tuple[Tuple[int, int], float]]:
+        """
+        Get (neighbor, step cost) pairs for a position
+        Costs come from the per-direction table, so no per-edge diagonal check is needed
+        """
+        node = self.nodes.get(position)
+        if node is None:
+            return [(n, self.get_cost(position, n)) for n in self._get_neighbors(*position)]
+        
+        weather_factor = self._weather_cost_factor()
+        blocked = self.city.blocked_roads
         return [
-            (nx, ny) for nx, ny in self._get_neighbors(x, y)
-            if self.city.is_walkable(nx, ny)
+            (neighbor, DIRECTION_COSTS[direction] * weather_factor)
+            for neighbor, direction in zip(node.neighbors, node.neighbor_dirs)
+            if neighbor not in blocked
         ]
     
     def get_cost(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> float:
@@ -89,11 +140,12 @@ class GridGraph:
             if abs(from_pos[0] - to_pos[0]) == 1 and abs(from_pos[1] - to_pos[1]) == 1:
                 cost = 1.414  # sqrt(2)
         
-        # Weather affects cost
+        return cost * self._weather_cost_factor()
+    
+    def _weather_cost_factor(self) -> float:
+        """Movement cost multiplier for current weather"""
         weather_modifier = self.city.get_weather_modifier()
-        cost *= (1.0 + (weather_modifier - 1.0) * 0.3)  # Weather increases cost
-        
-        return cost
+        return 1.0 + (weather_modifier - 1.0) * 0.3  # Weather increases cost
     
     def heuristic(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
         """
@@ -112,5 +164,5 @@ class GridGraph:
         return position in self.nodes and self.city.is_walkable(*position)
     
     def rebuild(self):
-        """Rebuild graph (call when roads are blocked/unblocked)"""
+        """Rebuild graph (call when the city terrain changes)"""
         self._build_graph()
\ No newline at end of file
@@ -3,10 +3,11 @@ Main Simulation Engine
 Orchestrates the city simulation tick loop
 """
 from typing import List, Optional, Dict, Any
+from collections import deque
 from datetime import datetime
 import random
 
-from core.city import City, Weather, Emergency
+from core.city import City, Weather, Emergency, Building, BuildingType
 from core.agent import Vehicle, VehicleType, VehicleStatus, create_vehicle
 from core.graph import GridGraph
 from core.events import EventBus, Event, EventType
@@ -34,6 +35,20 @@ class SimulationEngine:
         self.vehicles: List[Vehicle] = []
         self.event_bus: EventBus = None
         
+        # Lookup indexes (rebuilt on every initialize)
+        self._buildings_by_type: Dict[BuildingType, List[Building]] = {}
+        self._vehicles_by_type: Dict[VehicleType, List[Vehicle]] = {}
+        self._available_emergency: Dict[VehicleType, deque] = {}
+        
+        # Maintained counters (avoid per-tick scans)
+        self._active_vehicle_count: int = 0
+        
+        # Inputs of the last CSP solve (used to skip redundant re-solves)
+        self._last_csp_key: Optional[tuple] = None
+        
+        # Cached building serialization (only changes when CSP re-allocates power)
+        self._buildings_state_cache: List[dict] = []
+        
         # AI Engines
         self.search_engine: SearchEngine = None
         self.csp_engine: CSPEngine = None
@@ -47,6 +62,9 @@ class SimulationEngine:
         self.is_running: bool = False
         self.is_paused: bool = False
         
+        # Settings read on every tick, cached once
+        self.csp_tick_interval: int = settings.CSP_TICK_INTERVAL
+        
         # Statistics
         self.stats = {
             "total_emergencies": 0,
@@ -64,6 +82,11 @@ class SimulationEngine:
         # Create city
         self.city = City(settings.GRID_SIZE)
         
+        # Index buildings by type (buildings are static once the city is generated)
+        self._buildings_by_type = {}
+        for building in self.city.buildings:
+            self._buildings_by_type.setdefault(building.type, []).append(building)
+        
         # Create graph for pathfinding
         self.graph = GridGraph(self.city)
         
@@ -83,6 +106,8 @@ class SimulationEngine:
         
         # Initial CSP run
         self. csp_engine.solve()
+        self._last_csp_key = self._csp_input_key()
+        self._refresh_buildings_state()
         
         logger.info("Simulation Engine initialized successfully")
     
@@ -101,7 +126,7 @@ class SimulationEngine:
             self.vehicles. append(vehicle)
         
         # Spawn ambulance near hospital
-        hospital = next((b for b in self.city.buildings if b.type. value == "hospital"), None)
+        hospital = self._get_building(BuildingType.HOSPITAL)
         if hospital:
             ambulance = create_vehicle(
                 "ambulance_1",
@@ -111,7 +136,7 @@ class SimulationEngine:
             self.vehicles.append(ambulance)
         
         # Spawn fire truck near fire station
-        fire_station = next((b for b in self.city.buildings if b.type.value == "fire_station"), None)
+        fire_station = self._get_building(BuildingType.FIRE_STATION)
         if fire_station:
             fire_truck = create_vehicle(
                 "fire_truck_1",
@@ -120,7 +145,34 @@ class SimulationEngine:
             )
             self.vehicles.append(fire_truck)
         
-        logger.info(f"Spawned {len(self.vehicles)} vehicles")
+        # Index vehicles by type and track which emergency vehicles are free
+        self._vehicles_by_type = {}
+        for vehicle in self.vehicles:
+            self._vehicles_by_type.setdefault(vehicle.type, []).append(vehicle)
+            vehicle.on_status_change = self._on_vehicle_status_change
+        
+        self._active_vehicle_count = sum(
+            1 for v in self.vehicles if v.status == VehicleStatus.MOVING
+        )
+        
+        self._available_emergency = {
+            VehicleType.AMBULANCE: deque(self._vehicles_by_type.get(VehicleType.AMBULANCE, [])),
+            VehicleType.FIRE_TRUCK: deque(self._vehicles_by_type.get(VehicleType.FIRE_TRUCK, []))
+        }
+        
+        logger.info("Spawned %s vehicles", len(self.vehicles))
+    
+    def _on_vehicle_status_change(self, old_status: VehicleStatus, new_status: VehicleStatus):
+        """Keep the moving-vehicle counter in sync with status transitions"""
+        if old_status == VehicleStatus.MOVING:
+            self._active_vehicle_count -= 1
+        if new_status == VehicleStatus.MOVING:
+            self._active_vehicle_count += 1
+    
+    def _get_building(self, building_type: BuildingType) -> Optional[Building]:
+        """Get the first building of a given type, if any"""
+        buildings = self._buildings_by_type.get(building_type)
+        return buildings[0] if buildings else None
     
     def _get_random_road_position(self) -> tuple:
         """Get a random walkable position"""
@@ -142,7 +194,8 @@ class SimulationEngine:
             EventType.SIMULATION_START,
             self.tick,
             "Simulation Started",
-            "NEXUS simulation is now running"
+            "NEXUS simulation is now running",
+            external=True
         )
         
         logger.info("Simulation started")
@@ -155,7 +208,8 @@ class SimulationEngine:
             EventType.SIMULATION_PAUSE,
             self.tick,
             "Simulation Paused",
-            "NEXUS simulation has been paused"
+            "NEXUS simulation has been paused",
+            external=True
         )
         
         logger.info("Simulation paused")
@@ -186,13 +240,22 @@ class SimulationEngine:
         Returns:
             List of events that occurred this tick
         """
+        # Dispatch events queued by API handlers since the last tick
+        self.event_bus.drain_external()
+        
         if not self.is_running or self.is_paused:
             return []
         
         self.tick += 1
         events = []
         
-        # 1. Update all vehicles
+        # One timestamp shared by every event of this tick
+        now = datetime.utcnow()
+        
+        # 1. Update all vehicles, collecting logic engine inputs in the same pass
+        logic_inputs = []
+        stuck_vehicles = 0
+        
         for vehicle in self. vehicles:
             vehicle.update(self.tick)
             
@@ -207,23 +270,29 @@ class SimulationEngine:
             elif vehicle.status == VehicleStatus.IDLE and not vehicle.is_emergency:
                 if random.random() < 0.1:  # 10% chance per tick
                     self._assign_random_destination(vehicle)
+            
+            if vehicle.status == VehicleStatus.STUCK:
+                stuck_vehicles += 1
+            logic_inputs.append(self.logic_engine.build_vehicle_context(vehicle, self.tick))
         
-        # 2. Run CSP power allocation periodically
-        if self.tick % settings.CSP_TICK_INTERVAL == 0:
+        # 2. Run CSP power allocation periodically (skip when inputs are unchanged)
+        if self.tick % self.csp_tick_interval == 0 and self._csp_input_key() != self._last_csp_key:
             allocation = self.csp_engine. solve()
+            self._last_csp_key = self._csp_input_key()
+            self._refresh_buildings_state()
             summary = self. csp_engine.get_allocation_summary()
             
             # Log CSP decision
             self.xai_engine.explain_csp_decision(
                 self.tick,
                 allocation,
-                settings. TOTAL_POWER,
+                self.csp_engine.total_power,
                 summary['critical_satisfied'],
                 []
             )
         
         # 3. Bayesian prediction for emergencies
-        num_active_vehicles = sum(1 for v in self. vehicles if v.status == VehicleStatus.MOVING)
+        num_active_vehicles = self._active_vehicle_count
         
         # Predict accidents
         should_spawn_accident, prob, factors = self.bayesian_network. predict_accident(
@@ -244,6 +313,7 @@ class SimulationEngine:
                 events.append(Event(
                     type=EventType. EMERGENCY_SPAWN,
                     tick=self.tick,
+                    timestamp=now,
                     title="Accident Reported",
                     description=f"Accident at {emergency.position}",
                     severity="critical",
@@ -266,6 +336,7 @@ class SimulationEngine:
                 events.append(Event(
                     type=EventType.EMERGENCY_SPAWN,
                     tick=self.tick,
+                    timestamp=now,
                     title="Fire Reported",
                     description=f"Fire at {emergency.position}",
                     severity="critical",
@@ -273,7 +344,7 @@ class SimulationEngine:
                 ))
         
         # 4. Run logic engine for anomaly detection
-        alerts = self.logic_engine.evaluate(self.tick, self.vehicles)
+        alerts = self.logic_engine.evaluate_pre_collected(self.tick, logic_inputs, stuck_vehicles)
         for alert in alerts:
             self. xai_engine.explain_logic_decision(
                 self.tick,
@@ -287,6 +358,7 @@ class SimulationEngine:
             events.append(Event(
                 type=EventType.AI_ALERT,
                 tick=self.tick,
+                timestamp=now,
                 title=alert.rule_name,
                 description=alert.message,
                 severity=alert.alert_level.value,
@@ -322,22 +394,17 @@ class SimulationEngine:
         """Dispatch appropriate emergency vehicle"""
         # Find available emergency vehicle
         if emergency.type == "accident": 
-            vehicle = next(
-                (v for v in self.vehicles 
-                 if v.type == VehicleType.AMBULANCE and v.active_mission is None),
-                None
-            )
+            vehicle_type = VehicleType.AMBULANCE
         else:  # fire
-            vehicle = next(
-                (v for v in self.vehicles 
-                 if v.type == VehicleType. FIRE_TRUCK and v. active_mission is None),
-                None
-            )
+            vehicle_type = VehicleType.FIRE_TRUCK
         
-        if not vehicle:
-            logger.warning(f"No available emergency vehicle for {emergency.id}")
+        available = self._available_emergency.get(vehicle_type)
+        if not available:
+            logger.warning("No available emergency vehicle for %s", emergency.id)
             return
         
+        vehicle = available[0]
+        
         # Calculate path to emergency
         path = self. search_engine.find_path(
             vehicle.position,
@@ -346,6 +413,7 @@ class SimulationEngine:
         )
         
         if path:
+            available.popleft()
             vehicle.assign_mission(emergency.id, emergency.position)
             vehicle.set_path(path[1:])
             emergency.assigned_vehicle_id = vehicle.id
@@ -363,47 +431,41 @@ class SimulationEngine:
                     plan.get_task_tree_string()
                 )
             
-            logger.info(f"Dispatched {vehicle.id} to {emergency. id}")
+            logger.info("Dispatched %s to %s", vehicle.id, emergency.id)
     
     def _handle_mission_arrival(self, vehicle: Vehicle):
         """Handle emergency vehicle arriving at destination"""
         emergency_id = vehicle.active_mission
         
         # Find and resolve emergency
-        for emergency in self.city.emergencies:
-            if emergency.id == emergency_id:
-                self.city.resolve_emergency(emergency_id)
-                self.stats["resolved_emergencies"] += 1
-                
-                # Send vehicle back to base
-                base_pos = self._get_vehicle_base(vehicle)
-                path = self.search_engine.find_path(
-                    vehicle.position,
-                    base_pos,
-                    algorithm="astar"
-                )
-                
-                vehicle.complete_mission()
-                
-                if path:
-                    vehicle.set_path(path[1:])
-                
-                logger.info(f"Emergency {emergency_id} resolved by {vehicle.id}")
-                break
+        emergency = self.city.emergency_index.get(emergency_id)
+        if emergency:
+            self.city.resolve_emergency(emergency_id)
+            self.stats["resolved_emergencies"] += 1
+            
+            # Send vehicle back to base
+            base_pos = self._get_vehicle_base(vehicle)
+            path = self.search_engine.find_path(
+                vehicle.position,
+                base_pos,
+                algorithm="astar"
+            )
+            
+            vehicle.complete_mission()
+            self._available_emergency[vehicle.type].append(vehicle)
+            
+            if path:
+                vehicle.set_path(path[1:])
+            
+            logger.info("Emergency %s resolved by %s", emergency_id, vehicle.id)
     
     def _get_vehicle_base(self, vehicle: Vehicle) -> tuple:
         """Get base position for emergency vehicle"""
         if vehicle.type == VehicleType.AMBULANCE:
-            hospital = next(
-                (b for b in self.city.buildings if b.type.value == "hospital"),
-                None
-            )
+            hospital = self._get_building(BuildingType.HOSPITAL)
             return hospital.position if hospital else (5, 10)
         else: 
-            fire_station = next(
-                (b for b in self.city. buildings if b.type.value == "fire_station"),
-                None
-            )
+            fire_station = self._get_building(BuildingType.FIRE_STATION)
             return fire_station.position if fire_station else (15, 10)
     
     def set_weather(self, weather:  str):
@@ -415,7 +477,8 @@ class SimulationEngine:
             self. tick,
             "Weather Changed",
             f"Weather is now {weather}",
-            data={"weather": weather}
+            data={"weather": weather},
+            external=True
         )
     
     def get_state(self) -> dict:
@@ -427,17 +490,8 @@ class SimulationEngine:
             "weather": self.city.weather. value,
             "grid_size": self.city.size,
             "vehicles": [v.get_state_dict() for v in self.vehicles],
-            "buildings": [
-                {
-                    "id": b.id,
-                    "type": b.type.value,
-                    "position": {"x": b.position[0], "y": b.position[1]},
-                    "power_requirement": b.power_requirement,
-                    "allocated_power": b.allocated_power,
-                    "color": b.color
-                }
-                for b in self.city.buildings
-            ],
+            # Copy each cached dict so callers can't corrupt the cache (nested position is shared)
+            "buildings": [dict(b) for b in self._buildings_state_cache],
             "emergencies": [
                 {
                     "id": e.id,
@@ -447,16 +501,37 @@ class SimulationEngine:
                     "resolved": e.resolved,
                     "assigned_vehicle": e.assigned_vehicle_id
                 }
-                for e in self.city. emergencies if not e.resolved
+                for e in self.city.active_emergencies.values()
             ],
             "blocked_roads": [{"x": p[0], "y": p[1]} for p in self.city.blocked_roads],
             "stats": self.stats
         }
     
+    def _csp_input_key(self) -> tuple:
+        """Fingerprint of everything the CSP allocation depends on"""
+        return (
+            tuple(b.power_requirement for b in self.city.buildings),
+            self.csp_engine.total_power
+        )
+    
+    def _refresh_buildings_state(self):
+        """Rebuild cached building state (call after power allocation changes)"""
+        self._buildings_state_cache = [
+            {
+                "id": b.id,
+                "type": b.type.value,
+                "position": {"x": b.position[0], "y": b.position[1]},
+                "power_requirement": b.power_requirement,
+                "allocated_power": b.allocated_power,
+                "color": b.color
+            }
+            for b in self.city.buildings
+        ]
+    
     def get_metrics(self) -> dict:
         """Get simulation metrics"""
-        active_emergencies = sum(1 for e in self.city.emergencies if not e.resolved)
-        active_vehicles = sum(1 for v in self.vehicles if v. status == VehicleStatus. MOVING)
+        active_emergencies = len(self.city.active_emergencies)
+        active_vehicles = self._active_vehicle_count
         
         power_summary = self.csp_engine. get_allocation_summary()
         
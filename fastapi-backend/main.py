@@ -5,8 +5,12 @@ Production-grade smart city simulation system with 6 AI engines
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 import asyncio
-from typing import Dict, Set
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 
 from api import auth, simulation, state, websocket
 from services.simulation_service import SimulationService
@@ -15,25 +19,40 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+
+@dataclass
+class ClientState:
+    """Per-connection broadcast bookkeeping"""
+    # Frames waiting for this client's writer task, the only coroutine that sends on the socket
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    last_frame: int = 0  # Sequence of the newest frame queued
+
+
 # Global simulation service instance
 sim_service: SimulationService = None
-active_websockets: Set[WebSocket] = set()
+active_websockets: Dict[WebSocket, ClientState] = {}
+
+# Single worker so engine state is only ever mutated by one tick at a time
+tick_executor: ThreadPoolExecutor = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
-    global sim_service
+    global sim_service, tick_executor
     
     logger.info("🚀 NEXUS Backend Starting...")
     
+    tick_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sim-tick")
+    
     # Initialize simulation service
     sim_service = SimulationService()
     app.state.sim_service = sim_service
     app.state.active_websockets = active_websockets
     
-    # Start simulation in background
-    asyncio.create_task(simulation_loop())
+    # Start simulation in background (keep a handle so shutdown can cancel it)
+    app.state.sim_task = asyncio.create_task(simulation_loop())
+    app.state.sim_task.add_done_callback(_on_sim_task_done)
     
     logger.info("✅ NEXUS Backend Ready")
     
@@ -42,7 +61,33 @@ async def lifespan(app: FastAPI):
     # Cleanup
     logger.info("🛑 NEXUS Backend Shutting Down...")
     if sim_service:
-        sim_service.stop()
+        # stop() takes the engine lock, so queue it behind any running tick instead of blocking the loop
+        await asyncio.get_running_loop().run_in_executor(tick_executor, sim_service.stop)
+    sim_task = app.state.sim_task
+    crashed_earlier = sim_task.done()  # Already reported by _on_sim_task_done
+    sim_task.cancel()
+    (result,) = await asyncio.gather(sim_task, return_exceptions=True)
+    if (
+        not crashed_earlier
+        and isinstance(result, BaseException)
+        and not isinstance(result, asyncio.CancelledError)
+    ):
+        logger.error("Simulation loop failed during shutdown: %s", result, exc_info=result)
+    tick_executor.shutdown(wait=False)
+
+
+def _on_sim_task_done(task: asyncio.Task):
+    """Report a simulation loop that ended outside shutdown and stop the server"""
+    if task.cancelled():
+        return
+    
+    exc = task.exception()
+    if exc is None:
+        return
+    
+    logger.critical("Simulation loop crashed: %s", exc, exc_info=exc)
+    # Shut the server down gracefully so the process supervisor restarts it
+    os.kill(os.getpid(), signal.SIGTERM)
 
 
 app = FastAPI(
@@ -89,23 +134,84 @@ async def root():
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket connection for real-time simulation updates"""
     await websocket.accept()
-    active_websockets.add(websocket)
     
-    logger.info(f"WebSocket connected. Total connections: {len(active_websockets)}")
+    # Queue the replay and register with no await in between, so no broadcast can
+    # interleave: live frames land behind the replay and last_frame dedupes overlap
+    client = ClientState()
+    for seq, frame in sim_service.recent_frames(settings.WS_REPLAY_FRAMES):
+        client.queue.put_nowait(frame)
+        client.last_frame = seq
+    active_websockets[websocket] = client
+    writer = asyncio.create_task(_client_writer(websocket, client))
+    
+    logger.info("WebSocket connected. Total connections: %s", len(active_websockets))
     
     try:
         # Keep connection alive and handle incoming messages
         while True:
             data = await websocket.receive_text()
             # Handle client messages if needed
-            logger.debug(f"Received from client: {data}")
+            logger.debug("Received from client: %s", data)
     except WebSocketDisconnect:
-        active_websockets.remove(websocket)
-        logger.info(f"WebSocket disconnected. Total connections: {len(active_websockets)}")
+        # Broadcast may already have dropped this socket
+        active_websockets.pop(websocket, None)
+        logger.info("WebSocket disconnected. Total connections: %s", len(active_websockets))
+    except Exception as e:
+        logger.error("WebSocket error: %s", e)
+        active_websockets.pop(websocket, None)
+    finally:
+        writer.cancel()
+
+
+async def _client_writer(websocket: WebSocket, client: ClientState):
+    """Send a client's queued frames in order, one at a time, dropping the client on failure"""
+    try:
+        while True:
+            frame = await client.queue.get()
+            await websocket.send_text(frame)
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
-        if websocket in active_websockets:
-            active_websockets.remove(websocket)
+        logger.error("Failed to send to WebSocket: %s", e)
+        active_websockets.pop(websocket, None)
+
+
+def broadcast(seq: int, frame: str) -> int:
+    """
+    Queue a frame for every connected client without waiting on any of them
+    
+    Clients with WS_MAX_QUEUED frames still waiting skip the frame, so one slow
+    socket cannot stall the tick loop or pile up writes.
+    
+    Returns:
+        Number of clients that skipped the frame due to backpressure
+    """
+    skipped = 0
+    max_queued = settings.WS_MAX_QUEUED
+    
+    for client in active_websockets.values():
+        if seq <= client.last_frame:
+            continue  # Already queued via replay
+        
+        if client.queue.qsize() >= max_queued:
+            skipped += 1
+            continue
+        
+        client.last_frame = seq
+        client.queue.put_nowait(frame)
+    
+    return skipped
+
+
+async def _safe_tick(loop: asyncio.AbstractEventLoop):
+    """
+    Run one simulation tick in the tick executor
+    
+    A failed tick is logged and retried on the next cadence. Broadcast reads the
+    tick's output from sim_service.frames_since, not from this call.
+    """
+    try:
+        await loop.run_in_executor(tick_executor, sim_service.tick)
+    except Exception as e:
+        logger.error("Simulation tick failed: %s", e, exc_info=True)
 
 
 async def simulation_loop():
@@ -114,40 +220,57 @@ async def simulation_loop():
     
     logger.info("🔄 Simulation loop started")
     
-    while True:
-        try:
+    # Schedule ticks against a monotonic deadline so work time doesn't drift the cadence
+    loop = asyncio.get_running_loop()
+    period = 1.0 / settings.SIMULATION_FPS
+    next_deadline = loop.time()
+    frame_cursor = 0
+    
+    try:
+        while True:
             if sim_service and sim_service.is_running:
-                # Execute one simulation tick
-                events = sim_service.tick()
+                # Execute one simulation tick off the event loop
+                await _safe_tick(loop)
                 
-                # Broadcast events to all connected WebSocket clients
-                if events and active_websockets:
-                    for event in events:
-                        disconnected = set()
-                        for ws in active_websockets:
-                            try:
-                                await ws.send_json(event.dict())
-                            except Exception as e:
-                                logger.error(f"Failed to send to WebSocket: {e}")
-                                disconnected.add(ws)
-                        
-                        # Remove disconnected clients
-                        active_websockets.difference_update(disconnected)
+                # Deliver async event subscribers queued during the tick
+                sim_service.event_bus.dispatch_pending_async()
+                
+                # Pull frames serialized since the last broadcast (advances even with no clients)
+                frames, frame_cursor = sim_service.frames_since(frame_cursor)
+                
+                # Broadcast frames to all connected WebSocket clients
+                if frames and active_websockets:
+                    for seq, frame in frames:
+                        skipped = broadcast(seq, frame)
+                        if skipped:
+                            logger.debug("Frame %s skipped for %s backed-up client(s)", seq, skipped)
+            elif sim_service:
+                # Paused/stopped: still publish queued control events (pause, weather) promptly
+                await loop.run_in_executor(tick_executor, sim_service.drain_events)
+                sim_service.event_bus.dispatch_pending_async()
             
             # Control simulation speed (10-15 FPS)
-            await asyncio.sleep(1.0 / settings.SIMULATION_FPS)
-            
-        except Exception as e:
-            logger.error(f"Simulation loop error: {e}", exc_info=True)
-            await asyncio.sleep(1.0)
-
+            next_deadline += period
+            sleep_for = next_deadline - loop.time()
+            if sleep_for < 0:
+                # Fell behind: restart the cadence instead of bursting to catch up
+                next_deadline = loop.time()
+            await asyncio.sleep(max(0.0, sleep_for))
+    except asyncio.CancelledError:
+        logger.info("🛑 Simulation loop cancelled")
+        raise
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        # uvloop + httptools from uvicorn[standard] (uvloop has no Windows build)
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets"
     )
\ No newline at end of file
@@ -19,7 +19,7 @@ from .city_state import (
     WSMessage,
     SimulationMetrics
 )
-from .user import User, UserCreate, UserInDB, UserResponse
+from .user import User, UserCreate, UserInDB, UserRecord, UserResponse, TokenClaims
 from .events import SimulationEvent, EventSeverity
 
 __all__ = [
@@ -43,7 +43,9 @@ __all__ = [
     "User",
     "UserCreate",
     "UserInDB",
+    "UserRecord",
     "UserResponse",
+    "TokenClaims",
     # Events
     "SimulationEvent",
     "EventSeverity"
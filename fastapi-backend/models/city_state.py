@@ -2,7 +2,7 @@
 Pydantic models for city state representation
 Used for API responses and WebSocket messages
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
@@ -63,6 +63,8 @@ class Path(BaseModel):
 
 # Vehicle State
 class VehicleState(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     id: str
     type: VehicleType
     position: Position
@@ -78,6 +80,8 @@ class VehicleState(BaseModel):
 
 # Building State
 class BuildingState(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     id: str
     type: BuildingType
     position: Position
@@ -100,6 +104,8 @@ class EmergencyState(BaseModel):
 
 # Complete City State
 class CityState(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     tick: int
     weather: WeatherType
     vehicles: List[VehicleState]
@@ -111,6 +117,8 @@ class CityState(BaseModel):
 
 # Event Log
 class EventLog(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     id: str
     tick: int
     timestamp: datetime
@@ -122,6 +130,8 @@ class EventLog(BaseModel):
 
 # AI Reasoning Log
 class ReasoningLog(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     id: str
     tick: int
     timestamp: datetime
@@ -1,7 +1,7 @@
 """
 Event Models for Simulation
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from enum import Enum
@@ -28,23 +28,19 @@ class SimulationEvent(BaseModel):
     """
     Simulation event for WebSocket broadcast
     """
+    model_config = ConfigDict(use_enum_values=True)
+    
     id: str
     tick: int
-    timestamp: datetime = Field(default_factory=datetime. utcnow)
+    # Tick producers pass one shared per-tick timestamp via model_construct; validated
+    # constructions (including the subclasses) still default to now
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
     event_type: str
     category: EventCategory = EventCategory.SIMULATION
     severity: EventSeverity = EventSeverity.INFO
     title: str
     description: str
     data: Dict[str, Any] = {}
-    
-    def dict(self, **kwargs):
-        """Override dict to serialize datetime and enums"""
-        d = super().dict(**kwargs)
-        d['timestamp'] = self. timestamp.isoformat()
-        d['category'] = self.category.value
-        d['severity'] = self. severity.value
-        return d
 
 
 class VehicleEvent(SimulationEvent):
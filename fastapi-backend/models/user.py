@@ -3,6 +3,7 @@ User Models for Authentication
 """
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
@@ -26,6 +27,21 @@ class UserInDB(UserBase):
     is_admin: bool = False
 
 
+@dataclass(slots=True)
+class UserRecord:
+    """
+    Stored user record (internal, already validated)
+    Plain slotted dataclass so lookups skip Pydantic attribute handling
+    """
+    username: str
+    email: str
+    hashed_password: str
+    full_name: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    is_active: bool = True
+    is_admin: bool = False
+
+
 class User(UserBase):
     """User model for API responses (no password)"""
     created_at: datetime
@@ -48,4 +64,16 @@ class TokenPayload(BaseModel):
     """JWT token payload"""
     sub: str  # username
     exp: datetime
-    iat: datetime
\ No newline at end of file
+    iat: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class TokenClaims:
+    """
+    Verified JWT claims returned by verify_token
+    Frozen so cached instances can be shared between requests safely
+    """
+    sub: str  # username
+    exp: Optional[int] = None
+    iat: Optional[int] = None
+    role: Optional[str] = None
@@ -5,8 +5,8 @@ Handles user management and token operations
 from typing import Optional, Dict
 from datetime import datetime
 
-from models.user import User, UserCreate, UserInDB, UserResponse
-from utils.security import hash_password, verify_password, create_token, verify_token
+from models.user import User, UserCreate, UserRecord, UserResponse
+from utils.security import hash_password, verify_password, needs_rehash, create_token, verify_token
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -20,7 +20,7 @@ class AuthService:
     
     def __init__(self):
         # In-memory user storage
-        self.users: Dict[str, UserInDB] = {}
+        self.users: Dict[str, UserRecord] = {}
         self.email_index: Dict[str, str] = {}  # email -> username mapping
         
         logger.info("AuthService initialized")
@@ -37,19 +37,19 @@ class AuthService:
         """
         # Check username exists
         if user_data.username in self.users:
-            logger.warning(f"Username already exists: {user_data.username}")
+            logger.warning("Username already exists: %s", user_data.username)
             return None
         
         # Check email exists
         if user_data.email in self. email_index:
-            logger. warning(f"Email already registered: {user_data.email}")
+            logger.warning("Email already registered: %s", user_data.email)
             return None
         
         # Hash password
         hashed_pw = hash_password(user_data.password)
         
-        # Create user in DB
-        user_in_db = UserInDB(
+        # Create user record (input already validated by UserCreate)
+        user_in_db = UserRecord(
             username=user_data.username,
             email=user_data.email,
             full_name=user_data.full_name,
@@ -61,7 +61,7 @@ class AuthService:
         self.users[user_data.username] = user_in_db
         self.email_index[user_data.email] = user_data.username
         
-        logger.info(f"User created: {user_data.username}")
+        logger.info("User created: %s", user_data.username)
         
         return UserResponse(
             username=user_in_db.username,
@@ -70,7 +70,7 @@ class AuthService:
             created_at=user_in_db.created_at
         )
     
-    def authenticate_user(self, username: str, password: str) -> Optional[UserInDB]:
+    def authenticate_user(self, username: str, password: str) -> Optional[UserRecord]:
         """
         Authenticate user with username and password
         
@@ -84,14 +84,18 @@ class AuthService:
         user = self.users.get(username)
         
         if not user: 
-            logger.warning(f"User not found: {username}")
+            logger.warning("User not found: %s", username)
             return None
         
         if not verify_password(password, user. hashed_password):
-            logger.warning(f"Invalid password for user: {username}")
+            logger.warning("Invalid password for user: %s", username)
             return None
         
-        logger.info(f"User authenticated: {username}")
+        # Upgrade legacy (e.g. bcrypt) or outdated hashes while the plain password is at hand
+        if needs_rehash(user.hashed_password):
+            user.hashed_password = hash_password(password)
+        
+        logger.info("User authenticated: %s", username)
         return user
     
     def get_user(self, username: str) -> Optional[User]:
@@ -134,11 +138,12 @@ class AuthService:
         Returns:
             JWT token string
         """
-        return create_token(data={"sub": username})
+        return create_token(data={"sub": username}, _copy=False)
     
     def validate_token(self, token: str) -> Optional[User]:
         """
         Validate JWT token and return user
+        Relies on JWT signature verification only; passwords are never re-checked here
         
         Args:
             token: JWT token string
@@ -146,16 +151,12 @@ class AuthService:
         Returns:
             User if token valid, None otherwise
         """
-        payload = verify_token(token)
-        
-        if not payload: 
-            return None
+        claims = verify_token(token)
         
-        username = payload.get("sub")
-        if not username:
+        if not claims: 
             return None
         
-        return self.get_user(username)
+        return self.get_user(claims.sub)
     
     def user_exists(self, username: str) -> bool:
         """Check if username exists"""
@@ -2,16 +2,30 @@
 Simulation Service - Main orchestrator for the simulation
 Wraps the core simulation engine and provides service-level functionality
 """
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import islice
+import threading
+import time
 
 from core.simulation import SimulationEngine
 from models.events import SimulationEvent, EventSeverity, EventCategory
 from utils.config import settings
 from utils.logger import setup_logger
+from utils import serialization
 
 logger = setup_logger(__name__)
 
+# Engine severity string -> API severity value (unknown values fall back to INFO).
+# Stored as plain strings, matching what use_enum_values keeps on validated events.
+_SEVERITY_MAP = {
+    "info": EventSeverity.INFO.value,
+    "warning": EventSeverity.WARNING.value,
+    "critical": EventSeverity.CRITICAL.value
+}
+_DEFAULT_SEVERITY = EventSeverity.INFO.value
+
 
 class SimulationService:
     """
@@ -26,8 +40,20 @@ class SimulationService:
         self.engine = SimulationEngine()
         
         # Service state
+        # Wall-clock anchor plus monotonic readings; datetimes are derived on output
         self.created_at = datetime.utcnow()
-        self.last_tick_time = None
+        self._created_monotonic = time.monotonic()
+        self._last_tick_monotonic: Optional[float] = None
+        
+        # (sequence, serialized frame) pairs, oldest first, shared by broadcast and late-join replay
+        # Sequence numbers keep increasing across restarts, unlike engine ticks
+        self._recent: deque = deque(maxlen=settings.FRAME_BUFFER_SIZE)
+        self._frames_produced = 0  # Total frames ever appended (cursor space)
+        
+        # Ticks run on the sim-tick worker thread and API handlers in Starlette's threadpool;
+        # every engine mutation or multi-field read must hold this lock. Never take it on the
+        # event loop thread: it can be held for a whole tick.
+        self.lock = threading.RLock()
         
         logger.info("SimulationService initialized")
     
@@ -93,33 +119,44 @@ class SimulationService:
     
     def start(self):
         """Start the simulation"""
-        self.engine.start()
+        with self.lock:
+            self.engine.start()
         logger.info("Simulation started via service")
     
     def pause(self):
         """Pause the simulation"""
-        self.engine. pause()
+        with self.lock:
+            self.engine.pause()
         logger.info("Simulation paused via service")
     
     def resume(self):
         """Resume the simulation"""
-        self.engine. resume()
+        with self.lock:
+            self.engine.resume()
         logger.info("Simulation resumed via service")
     
     def stop(self):
         """Stop the simulation"""
-        self.engine. stop()
+        with self.lock:
+            self.engine.stop()
         logger.info("Simulation stopped via service")
     
     def restart(self):
         """Restart the simulation"""
-        self.engine.restart()
+        with self.lock:
+            self.engine.restart()
         logger.info("Simulation restarted via service")
     
     def set_weather(self, weather: str):
         """Change weather conditions"""
-        self.engine.set_weather(weather)
-        logger.info(f"Weather changed to {weather} via service")
+        with self.lock:
+            self.engine.set_weather(weather)
+        logger.info("Weather changed to %s via service", weather)
+    
+    def drain_events(self):
+        """Publish events queued by API handlers without advancing the simulation"""
+        with self.lock:
+            self.engine.event_bus.drain_external()
     
     def tick(self) -> List[SimulationEvent]:
         """
@@ -128,52 +165,109 @@ class SimulationService:
         Returns:
             List of events that occurred this tick
         """
-        self.last_tick_time = datetime.utcnow()
+        with self.lock:
+            return self._tick()
+    
+    def _tick(self) -> List[SimulationEvent]:
+        """Tick body; caller holds self.lock"""
+        self._last_tick_monotonic = time.monotonic()
         
         # Execute engine tick
         core_events = self.engine.update()
         
-        # Convert to SimulationEvent objects
+        # Convert to SimulationEvent objects (engine output is trusted, skip validation)
         events = []
+        category = EventCategory.SIMULATION.value
         for event in core_events:
-            sim_event = SimulationEvent(
+            sim_event = SimulationEvent.model_construct(
                 id=event.id,
                 tick=event.tick,
                 timestamp=event.timestamp,
-                event_type=event.type. value,
-                category=EventCategory. SIMULATION,
-                severity=EventSeverity(event.severity) if event.severity in ['info', 'warning', 'critical'] else EventSeverity.INFO,
+                event_type=event.type.value,
+                category=category,
+                severity=_SEVERITY_MAP.get(event.severity, _DEFAULT_SEVERITY),
                 title=event.title,
                 description=event.description,
                 data=event.data
             )
             events.append(sim_event)
         
+        if events:
+            # Serialize once here (off the event loop) for every client and replay
+            self._frames_produced += 1
+            self._recent.append((self._frames_produced, serialization.dumps({
+                "type": "tick",
+                "tick": self.engine.tick,
+                "events": [event.model_dump() for event in events]
+            })))
+        
         return events
     
+    def frames_since(self, cursor: int) -> Tuple[List[Tuple[int, str]], int]:
+        """
+        Get serialized tick frames produced after a cursor
+        
+        Args:
+            cursor: Cursor returned by a previous call (0 to start)
+        
+        Returns:
+            Tuple of (new (sequence, frame) pairs oldest first, updated cursor). Frames that
+            already fell out of the buffer are skipped.
+        """
+        produced = self._frames_produced
+        missed = min(produced - cursor, len(self._recent))
+        if missed <= 0:
+            return [], produced
+        return list(islice(self._recent, len(self._recent) - missed, None)), produced
+    
+    def recent_frames(self, limit: int) -> List[Tuple[int, str]]:
+        """
+        Get the newest serialized tick frames for replay
+        
+        Args:
+            limit: Maximum number of frames
+        
+        Returns:
+            Up to limit (sequence, frame) pairs, oldest first
+        """
+        # Snapshot first: the tick thread may append while a client connects
+        frames = tuple(self._recent)
+        return list(frames[-limit:]) if limit > 0 else []
+    
     def get_state(self) -> dict:
         """Get complete simulation state"""
-        return self.engine.get_state()
+        with self.lock:
+            return self.engine.get_state()
     
     def get_metrics(self) -> dict:
         """Get simulation metrics"""
-        metrics = self.engine.get_metrics()
+        with self.lock:
+            metrics = self.engine.get_metrics()
         
         # Add service-level metrics
-        metrics["service_uptime"] = (datetime.utcnow() - self.created_at).total_seconds()
+        metrics["service_uptime"] = time.monotonic() - self._created_monotonic
         
-        if self.last_tick_time:
-            metrics["last_tick"] = self.last_tick_time.isoformat()
+        last_tick_time = self.last_tick_time
+        if last_tick_time:
+            metrics["last_tick"] = last_tick_time.isoformat()
         
         return metrics
     
+    @property
+    def last_tick_time(self) -> Optional[datetime]:
+        """Wall-clock time of the last tick, derived from the monotonic reading"""
+        if self._last_tick_monotonic is None:
+            return None
+        return self.created_at + timedelta(seconds=self._last_tick_monotonic - self._created_monotonic)
+    
     def get_status(self) -> dict:
         """Get simulation status"""
+        last_tick_time = self.last_tick_time
         return {
             "is_running": self.is_running,
             "is_paused": self.is_paused,
             "tick": self.tick,
             "weather":  self.city.weather.value if self.city else "unknown",
             "created_at": self.created_at.isoformat(),
-            "last_tick": self.last_tick_time.isoformat() if self.last_tick_time else None
+            "last_tick": last_tick_time.isoformat() if last_tick_time else None
         }
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Tests for JWT verification
+Run from fastapi-backend with: python -m pytest
+"""
+import time
+
+import pytest
+
+from utils import security
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with an empty verified-token cache"""
+    security._token_cache.clear()
+    yield
+    security._token_cache.clear()
+
+
+def test_batch_matches_single_for_valid_token():
+    token = security.create_token({"sub": "alice", "role": "admin"})
+    
+    (batch_claims,) = security.verify_tokens_batch([token])
+    security._token_cache.clear()
+    single_claims = security.verify_token(token)
+    
+    assert single_claims is not None
+    assert batch_claims == single_claims
+
+
+def test_batch_matches_single_for_token_with_aud():
+    token = security.create_token({"sub": "alice", "aud": "other-service"})
+    
+    # Batch first: a looser batch check would cache claims that verify_token then serves
+    assert security.verify_tokens_batch([token]) == [None]
+    assert security.verify_token(token) is None
+
+
+@pytest.mark.parametrize("iat", ["not-a-number", time.time() + 3600])
+def test_batch_matches_single_for_bad_iat(iat):
+    token = security._jwt.encode(
+        {"sub": "alice", "iat": iat, "exp": int(time.time()) + 3600},
+        security._SIGNING_KEY,
+        algorithm=security._ALGORITHM
+    )
+    
+    assert security.verify_tokens_batch([token]) == [None]
+    assert security.verify_token(token) is None
@@ -1,14 +1,20 @@
 """
 NEXUS Utilities Package
 """
+from .concurrency import blocking_cpu, call_blocking
 from .config import settings, get_settings
 from .logger import setup_logger
-from .security import verify_token, create_token
+from .security import verify_token, verify_tokens_batch, create_token, tokens_equal_constant_time, tokens_equal
 
 __all__ = [
+    "blocking_cpu",
+    "call_blocking",
     "settings",
     "get_settings",
     "setup_logger",
     "verify_token",
-    "create_token"
+    "verify_tokens_batch",
+    "create_token",
+    "tokens_equal_constant_time",
+    "tokens_equal"
 ]
\ No newline at end of file
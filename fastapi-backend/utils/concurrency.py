@@ -0,0 +1,48 @@
+"""
+Concurrency Helpers for NEXUS System
+Marks CPU-bound functions and offloads them from the event loop
+"""
+import asyncio
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def blocking_cpu(fn: F) -> F:
+    """
+    Mark a function as CPU-bound and blocking (e.g. password hashing)
+    
+    Marked functions are run in a worker thread by call_blocking, so async
+    callers never stall the event loop on them.
+    
+    Args:
+        fn: Function to mark
+    
+    Returns:
+        The same function, tagged with __blocking_cpu__
+    """
+    fn.__blocking_cpu__ = True
+    return fn
+
+
+def is_blocking_cpu(fn: Callable) -> bool:
+    """Check whether a function was marked with @blocking_cpu"""
+    return getattr(fn, "__blocking_cpu__", False)
+
+
+async def call_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Canonical way to call a sync function from async code
+    
+    Args:
+        fn: Function to call
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+    
+    Returns:
+        fn's return value. Functions marked @blocking_cpu run in the default
+        thread pool; anything else is cheap and is called inline.
+    """
+    if is_blocking_cpu(fn):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return fn(*args, **kwargs)
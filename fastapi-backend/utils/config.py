@@ -17,8 +17,25 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # HS256 (shared SECRET_KEY) or EdDSA (Ed25519 key pair below)
+    SIGNING_KEY: str = ""  # Ed25519 private key PEM, for asymmetric ALGORITHM only
+    VERIFICATION_KEY: str = ""  # Ed25519 public key PEM (derived from SIGNING_KEY if empty)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Scheme for new password hashes: "argon2" (argon2id) or "bcrypt".
+    # Hashes of the other scheme still verify and are upgraded on next login.
+    PASSWORD_HASH_SCHEME: str = "argon2"
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 65536  # KiB (64 MiB)
+    ARGON2_PARALLELISM: int = 4
+    # bcrypt cost factor: hashing does 2^rounds iterations, so 10 is ~4x faster than 12.
+    # Only affects new hashes; verification uses the cost stored in each hash.
+    BCRYPT_ROUNDS: int = 12
+    # Opt-in cache of successful password checks (for flows that re-verify the same password)
+    PASSWORD_VERIFY_CACHE: bool = False
+    PASSWORD_VERIFY_CACHE_SIZE: int = 256
+    PASSWORD_VERIFY_CACHE_TTL_SECONDS: int = 30
+    TOKEN_CACHE_SIZE: int = 10000  # Decoded JWTs kept in the verify_token LRU
+    TOKEN_CACHE_TTL_SECONDS: int = 60  # Max time a decoded JWT is served from cache
     
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:3000"]
@@ -28,6 +45,9 @@ class Settings(BaseSettings):
     GRID_SIZE: int = 20  # 20x20 grid
     NUM_VEHICLES: int = 8
     NUM_EMERGENCY_VEHICLES: int = 2
+    FRAME_BUFFER_SIZE: int = 512  # Serialized tick frames kept for broadcast/replay
+    WS_REPLAY_FRAMES: int = 50  # Frames replayed to a newly connected client
+    WS_MAX_QUEUED: int = 4  # Queued frames before a slow client starts skipping live frames
     
     # CSP Engine
     CSP_TICK_INTERVAL: int = 20  # Run CSP every 20 ticks
@@ -78,16 +78,20 @@ def setup_logger(
 # Create default logger for the module
 default_logger = setup_logger("nexus")
 
+# Flags checked on every log call, read from settings once
+_DEBUG = settings.DEBUG
+_XAI_VERBOSE = settings.XAI_VERBOSE
+
 
 def log_event(event_type: str, message: str, data: dict = None):
     """Log a simulation event"""
-    default_logger. info(f"[{event_type. upper()}] {message}")
-    if data and settings.DEBUG:
-        default_logger.debug(f"  Data: {data}")
+    default_logger.info("[%s] %s", event_type.upper(), message)
+    if data and _DEBUG:
+        default_logger.debug("  Data: %s", data)
 
 
 def log_ai_decision(engine: str, decision: str, reasoning: str):
     """Log an AI engine decision"""
-    default_logger. info(f"[AI:{engine. upper()}] {decision}")
-    if settings.XAI_VERBOSE:
-        default_logger.debug(f"  Reasoning: {reasoning}")
\ No newline at end of file
+    default_logger.info("[AI:%s] %s", engine.upper(), decision)
+    if _XAI_VERBOSE:
+        default_logger.debug("  Reasoning: %s", reasoning)
\ No newline at end of file
@@ -2,23 +2,262 @@
 Security Utilities for NEXUS System
 JWT token management and password hashing
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+import base64
+import hashlib
+import hmac
+import json
+import os
+import platform
+import ssl
+import threading
+import time
+import bcrypt
 import jwt
-from passlib.context import CryptContext
+import jwt.api_jws
+import jwt.api_jwt
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 
+from models.user import TokenClaims
+from utils.concurrency import blocking_cpu, call_blocking
 from utils.config import settings
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def _read_cpu_flags() -> Optional[set]:
+    """CPU feature flags from /proc/cpuinfo (None where unavailable, e.g. macOS/Windows)"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return None
+
+
+def _log_hmac_backend():
+    """Log which OpenSSL build and CPU extensions back HMAC-SHA256 (startup only)"""
+    flags = _read_cpu_flags()
+    if flags is None:
+        logger.info("HMAC backend: %s (CPU flags unavailable)", ssl.OPENSSL_VERSION)
+        return
+    
+    sha_ni = "sha_ni" in flags
+    logger.info("HMAC backend: %s sha_ni=%s aes_ni=%s", ssl.OPENSSL_VERSION, sha_ni, "aes" in flags)
+    if not sha_ni and platform.machine() in ("x86_64", "AMD64"):
+        logger.warning(
+            "SHA-NI not reported by the CPU; HMAC-SHA256 uses the slower SIMD path. "
+            "Check the hypervisor's CPU flag passthrough."
+        )
+
+
+_log_hmac_backend()
+
+
+class _OrjsonJsonBackend:
+    """
+    Stand-in for the json module inside PyJWT's header/claims encoding
+    Falls back to stdlib json when a caller passes a custom encoder class
+    """
+    JSONEncoder = json.JSONEncoder
+    JSONDecodeError = orjson.JSONDecodeError
+    
+    @staticmethod
+    def dumps(obj: Any, *, separators=None, cls=None, sort_keys: bool = False, **kwargs) -> str:
+        # orjson output is always compact, matching PyJWT's separators=(",", ":")
+        if cls is not None or kwargs:
+            return json.dumps(obj, separators=separators, cls=cls, sort_keys=sort_keys, **kwargs)
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+    
+    loads = staticmethod(orjson.loads)
+
+
+# PyJWT looks json up at call time, so swapping the module reference is enough
+jwt.api_jws.json = _OrjsonJsonBackend
+jwt.api_jwt.json = _OrjsonJsonBackend
+
+def _load_asymmetric_keys() -> Tuple[Any, Any]:
+    """
+    Load the Ed25519 signing/verification key objects for EdDSA tokens
+    
+    Returns:
+        Tuple of (private key, public key). The private key is None for
+        verify-only deployments (VERIFICATION_KEY without SIGNING_KEY). With
+        neither configured an ephemeral key pair is generated, so tokens do
+        not survive a restart.
+    """
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+    from cryptography.hazmat.primitives.serialization import (
+        load_pem_private_key, load_pem_public_key
+    )
+    
+    private_key = None
+    if settings.SIGNING_KEY:
+        private_key = load_pem_private_key(settings.SIGNING_KEY.encode("utf-8"), password=None)
+    elif not settings.VERIFICATION_KEY:
+        logger.warning("No SIGNING_KEY configured for %s; using an ephemeral key pair", settings.ALGORITHM)
+        private_key = Ed25519PrivateKey.generate()
+    
+    if settings.VERIFICATION_KEY:
+        public_key = load_pem_public_key(settings.VERIFICATION_KEY.encode("utf-8"))
+    else:
+        public_key = private_key.public_key()
+    
+    return private_key, public_key
+
+
+# Token settings resolved once at import (settings are cached and never reloaded);
+# the key is pre-encoded so PyJWT doesn't re-encode it on every call
+_SECRET_KEY: bytes = settings.SECRET_KEY.encode("utf-8")
+_ALGORITHM: str = settings.ALGORITHM
+_ALGORITHMS: list = [settings.ALGORITHM]
+
+# One PyJWT instance with its options fixed up front, reused for every encode/decode
+_jwt = jwt.PyJWT({
+    "verify_signature": True,
+    "verify_exp": True,
+    "verify_nbf": True,
+    "verify_iat": True,
+    "require": []
+})
+
+# HMAC algorithms sign and verify with the shared secret; EdDSA uses parsed key objects
+if _ALGORITHM == "EdDSA":
+    _SIGNING_KEY, _VERIFICATION_KEY = _load_asymmetric_keys()
+    if _SIGNING_KEY is None:
+        logger.warning("Verify-only mode: no SIGNING_KEY configured, create_token is disabled")
+else:
+    _SIGNING_KEY = _VERIFICATION_KEY = _SECRET_KEY
+_DEFAULT_TTL_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_TOKEN_CACHE_TTL_SECONDS = settings.TOKEN_CACHE_TTL_SECONDS
+_TOKEN_CACHE_SIZE = settings.TOKEN_CACHE_SIZE
+
+# Recently verified tokens: blake2b(token) -> (claims, cached_until), LRU ordered.
+# Keyed by digest so raw bearer tokens are never retained in memory.
+_token_cache: "OrderedDict[bytes, Tuple[TokenClaims, float]]" = OrderedDict()
+# Verification also runs on threadpool workers; move_to_end/popitem must not interleave
+_token_cache_lock = threading.Lock()
+
+# Claims kept on TokenClaims; any other payload keys are dropped
+_CLAIM_FIELDS = frozenset(TokenClaims.__dataclass_fields__)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Fixed-size cache key for a token"""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def _to_claims(payload: Dict[str, Any]) -> Optional[TokenClaims]:
+    """Build TokenClaims from a verified payload (None if it has no subject)"""
+    try:
+        return TokenClaims(**{k: v for k, v in payload.items() if k in _CLAIM_FIELDS})
+    except TypeError:
+        return None
+
+
+def _get_cached_claims(key: bytes, now: float) -> Optional[TokenClaims]:
+    """Return still-valid cached claims (refreshing their LRU position), else None"""
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+        if cached is None:
+            return None
+        
+        claims, cached_until = cached
+        if cached_until > now:
+            _token_cache.move_to_end(key)
+            return claims
+        
+        del _token_cache[key]
+        return None
 
 
+def _cache_claims(key: bytes, claims: TokenClaims, now: float):
+    """Cache verified claims until the cache TTL or their exp, whichever is first"""
+    cached_until = now + _TOKEN_CACHE_TTL_SECONDS
+    if claims.exp is not None:
+        cached_until = min(cached_until, claims.exp)
+    
+    with _token_cache_lock:
+        _token_cache[key] = (claims, cached_until)
+        if len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment"""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+# bcrypt encodes salts with its own base64 alphabet (same bit layout, different symbols)
+_BCRYPT_B64 = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    b"./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+)
+_BCRYPT_SALT_PREFIX = b"$2b$%02d$" % settings.BCRYPT_ROUNDS
+
+
+class _SaltPool:
+    """
+    Hands out 16-byte bcrypt salts carved from one large os.urandom read
+    Each salt is used once; the pool refills when exhausted or after a fork
+    """
+    SALT_BYTES = 16
+    
+    def __init__(self, size: int = 1024):
+        self.size = size
+        self._buffer = b""
+        self._offset = 0
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def get(self) -> bytes:
+        """Take the next unused raw salt"""
+        with self._lock:
+            # A forked worker must never reuse salts buffered by its parent
+            if self._offset >= len(self._buffer) or self._pid != os.getpid():
+                self._buffer = os.urandom(self.SALT_BYTES * self.size)
+                self._offset = 0
+                self._pid = os.getpid()
+            
+            start = self._offset
+            self._offset += self.SALT_BYTES
+            return self._buffer[start:self._offset]
+
+
+_salt_pool = _SaltPool()
+
+
+def _gensalt() -> bytes:
+    """Equivalent of bcrypt.gensalt(settings.BCRYPT_ROUNDS) backed by the salt pool"""
+    encoded = base64.b64encode(_salt_pool.get()).translate(_BCRYPT_B64)
+    return _BCRYPT_SALT_PREFIX + encoded[:22]  # 16 bytes -> 22 chars (drop "==" padding)
+
+
+# New hashes use PASSWORD_HASH_SCHEME; stored hashes of either scheme always verify
+_PASSWORD_SCHEME = settings.PASSWORD_HASH_SCHEME.lower()
+_password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM
+)
+
+
+def _is_bcrypt_hash(hashed_password: str) -> bool:
+    """bcrypt hashes use the $2a$/$2b$/$2y$ modular crypt prefixes"""
+    return hashed_password.startswith("$2")
+
+
+@blocking_cpu
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt
+    Hash a password with the configured scheme (argon2id by default, or bcrypt)
     
     Args:
         password:  Plain text password
@@ -26,9 +265,57 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    return pwd_context.hash(password)
+    if _PASSWORD_SCHEME == "bcrypt":
+        return bcrypt.hashpw(password.encode("utf-8"), _gensalt()).decode("utf-8")
+    return _password_hasher.hash(password)
+
+
+def _check_password(plain_password: str, hashed_password: str) -> bool:
+    """Run the check matching the stored hash's scheme"""
+    if _is_bcrypt_hash(hashed_password):
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash should be replaced after a successful login
+    
+    Args:
+        hashed_password: Stored hash
+    
+    Returns:
+        True if the hash uses another scheme or outdated argon2 parameters
+    """
+    if _is_bcrypt_hash(hashed_password):
+        return _PASSWORD_SCHEME != "bcrypt"
+    if _PASSWORD_SCHEME == "bcrypt":
+        return True
+    try:
+        return _password_hasher.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
+
+
+# Opt-in cache of successful password checks: (keyed blake2b(plain), hash) -> expiry.
+# The per-process key means digests are useless outside this process; only
+# successes are cached, so wrong guesses always pay the full bcrypt cost.
+_PROCESS_KEY = os.urandom(32)
+_verify_cache: "OrderedDict[Tuple[bytes, bytes], float]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+_verify_cache_stats = {"hits": 0, "misses": 0}
 
 
+def _verify_cache_key(plain_password: str, hashed: bytes) -> Tuple[bytes, bytes]:
+    """Cache key that never retains the plain password"""
+    digest = hashlib.blake2b(plain_password.encode("utf-8"), digest_size=16, key=_PROCESS_KEY).digest()
+    return digest, hashed
+
+
+@blocking_cpu
 def verify_password(plain_password:  str, hashed_password: str) -> bool:
     """
     Verify a password against its hash
@@ -40,12 +327,84 @@ def verify_password(plain_password:  str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if not settings.PASSWORD_VERIFY_CACHE:
+        return _check_password(plain_password, hashed_password)
+    
+    hashed = hashed_password.encode("utf-8")
+    
+    key = _verify_cache_key(plain_password, hashed)
+    now = time.time()
+    with _verify_cache_lock:
+        expires = _verify_cache.get(key)
+        if expires is not None and expires > now:
+            _verify_cache_stats["hits"] += 1
+            return True
+        _verify_cache_stats["misses"] += 1
+    
+    if not _check_password(plain_password, hashed_password):
+        return False
+    
+    with _verify_cache_lock:
+        _verify_cache[key] = now + settings.PASSWORD_VERIFY_CACHE_TTL_SECONDS
+        _verify_cache.move_to_end(key)
+        if len(_verify_cache) > settings.PASSWORD_VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+    
+    return True
+
+
+def forget_password_verifications(hashed_password: str):
+    """
+    Drop cached successful verifications for one password hash (e.g. on logout)
+    
+    Args:
+        hashed_password: Stored hash whose cache entries should be purged
+    """
+    hashed = hashed_password.encode("utf-8")
+    with _verify_cache_lock:
+        for key in [k for k in _verify_cache if k[1] == hashed]:
+            del _verify_cache[key]
+
+
+def get_password_cache_stats() -> Dict[str, int]:
+    """Get verify_password cache hit/miss counters and current size"""
+    with _verify_cache_lock:
+        return {**_verify_cache_stats, "size": len(_verify_cache)}
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in a worker thread so the event loop keeps serving requests
+    (bcrypt and argon2 release the GIL while hashing)
+    
+    Args:
+        password: Plain text password
+    
+    Returns:
+        Hashed password string
+    """
+    return await call_blocking(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in a worker thread so the event loop keeps serving requests
+    
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+    
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await call_blocking(verify_password, plain_password, hashed_password)
 
 
 def create_token(
     data: Dict[str, Any],
-    expires_delta: Optional[timedelta] = None
+    expires_delta: Optional[timedelta] = None,
+    *,
+    _copy: bool = True
 ) -> str:
     """
     Create a JWT access token
@@ -53,32 +412,36 @@ def create_token(
     Args: 
         data:  Payload data to encode
         expires_delta: Optional custom expiration time
+        _copy: Set False when the caller owns data and won't reuse it;
+            iat/exp are then written into data directly
     
     Returns:
         Encoded JWT token string
+    
+    Raises:
+        RuntimeError: If this process is verify-only (no signing key)
     """
-    to_encode = data.copy()
+    if _SIGNING_KEY is None:
+        raise RuntimeError("token signing disabled: no SIGNING_KEY configured")
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode = data.copy() if _copy else data
     
-    to_encode.update({
-        "exp": expire,
-        "iat": datetime.utcnow()
-    })
+    # JWT claims are epoch seconds; ints skip PyJWT's datetime conversion
+    now = int(time.time())
+    ttl = int(expires_delta.total_seconds()) if expires_delta else _DEFAULT_TTL_SECONDS
+    to_encode["iat"] = now
+    to_encode["exp"] = now + ttl
     
-    encoded_jwt = jwt.encode(
+    encoded_jwt = _jwt.encode(
         to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
+        _SIGNING_KEY,
+        algorithm=_ALGORITHM
     )
     
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[Dict[str, Any]]: 
+def verify_token(token: str) -> Optional[TokenClaims]: 
     """
     Verify and decode a JWT token
     
@@ -86,43 +449,175 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
         token: JWT token string
     
     Returns:
-        Decoded payload if valid, None otherwise
+        Verified claims if valid, None otherwise
     """
+    # Signature already checked for this exact token; only expiry can change
+    key = _token_cache_key(token)
+    now = time.time()
+    cached = _get_cached_claims(key, now)
+    if cached is not None:
+        return cached
+    
     try:
-        payload = jwt.decode(
+        payload = _jwt.decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
+            _VERIFICATION_KEY,
+            algorithms=_ALGORITHMS
         )
-        return payload
     except jwt.ExpiredSignatureError:
         logger.warning("Token has expired")
         return None
-    except jwt.JWTError as e:
-        logger.error(f"JWT validation error: {e}")
+    except jwt.PyJWTError as e:
+        logger.error("JWT validation error: %s", e)
+        return None
+    
+    claims = _to_claims(payload)
+    if claims is None:
+        logger.error("JWT validation error: token has no subject")
         return None
+    
+    _cache_claims(key, claims, now)
+    return claims
+
 
+# Digest constructors for the HMAC algorithms verify_tokens_batch handles itself
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512
+}
 
-def get_token_expiry(token: str) -> Optional[datetime]:
+
+def _claims_valid(payload: Dict[str, Any], now: float) -> bool:
+    """
+    Check registered claims exactly as PyJWT 2.8 decode does with our options
+    (no leeway, issuer or audience): exp/nbf/iat must coerce with int(), and
+    any non-empty aud is rejected because no audience is configured
     """
-    Get expiration datetime from a token
+    try:
+        if "exp" in payload and int(payload["exp"]) <= now:
+            return False
+        if "nbf" in payload and int(payload["nbf"]) > now:
+            return False
+        if "iat" in payload and int(payload["iat"]) > now:
+            return False
+    except (ValueError, TypeError):
+        return False
+    
+    return not payload.get("aud")
+
+
+def _verify_hmac_token(base_mac: "hmac.HMAC", token: str, now: float) -> Optional[Dict[str, Any]]:
+    """
+    Verify one HS* token against a pre-keyed HMAC context
+    Applies the same header and claim checks as jwt.decode, so a token is accepted
+    here only if verify_token would accept it too
+    """
+    try:
+        signing_input, signature_b64 = token.rsplit(".", 1)
+        header_b64, payload_b64 = signing_input.split(".", 1)
+        
+        # copy() clones the keyed inner/outer digest state, skipping the key schedule
+        mac = base_mac.copy()
+        mac.update(signing_input.encode("ascii"))
+        if not hmac.compare_digest(mac.digest(), _b64url_decode(signature_b64)):
+            return None
+        
+        header = orjson.loads(_b64url_decode(header_b64))
+        if header.get("alg") != _ALGORITHM:
+            return None
+        if "kid" in header and not isinstance(header["kid"], str):
+            return None
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except (ValueError, TypeError, AttributeError):
+        # ValueError covers bad segments, binascii.Error and orjson.JSONDecodeError
+        return None
+    
+    if not isinstance(payload, dict) or not _claims_valid(payload, now):
+        return None
+    
+    return payload
+
+
+def verify_tokens_batch(tokens: List[str]) -> List[Optional[TokenClaims]]:
+    """
+    Verify and decode many JWT tokens, keying the HMAC only once
+    
+    Args:
+        tokens: JWT token strings
+    
+    Returns:
+        Verified claims (or None if invalid) for each token, in input order
+    """
+    digest = _HMAC_DIGESTS.get(_ALGORITHM)
+    if digest is None:
+        # Asymmetric algorithms have no shared key schedule to reuse
+        return [verify_token(token) for token in tokens]
+    
+    base_mac = hmac.new(_SECRET_KEY, digestmod=digest)
+    now = time.time()
+    results = []
+    for token in tokens:
+        key = _token_cache_key(token)
+        claims = _get_cached_claims(key, now)
+        if claims is None:
+            payload = _verify_hmac_token(base_mac, token, now)
+            claims = _to_claims(payload) if payload is not None else None
+            if claims is not None:
+                _cache_claims(key, claims, now)
+        results.append(claims)
+    
+    return results
+
+
+def get_token_expiry_unverified(token: str) -> Optional[datetime]:
+    """
+    Read the expiration datetime from a token WITHOUT verifying its signature
+    Only use on tokens that were already verified (e.g. via verify_token)
     
     Args: 
         token: JWT token string
     
     Returns:
-        Expiration datetime if valid, None otherwise
+        Expiration datetime if present and parseable, None otherwise
     """
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings. ALGORITHM],
-            options={"verify_exp": False}  # Don't verify to get expiry even if expired
-        )
+        _, payload_b64, _ = token.split(".", 2)
+        payload = orjson.loads(_b64url_decode(payload_b64))
         exp = payload.get("exp")
         if exp: 
             return datetime.fromtimestamp(exp)
         return None
-    except jwt.JWTError: 
-        return None
\ No newline at end of file
+    except (ValueError, TypeError, AttributeError, OverflowError, OSError):
+        # ValueError covers bad segments, binascii.Error and orjson.JSONDecodeError
+        return None
+
+
+def tokens_equal_constant_time(a: str, b: str) -> bool:
+    """
+    Compare two secrets (tokens, API keys, reset codes) without timing leaks
+    Use for any comparison against an attacker-supplied value
+    
+    Args:
+        a: First token
+        b: Second token
+    
+    Returns:
+        True if the tokens are identical
+    """
+    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
+
+
+def tokens_equal(a: str, b: str) -> bool:
+    """
+    Plain (short-circuiting) token comparison
+    Only for non-security compares, e.g. dedup of tokens already verified by verify_token
+    
+    Args:
+        a: First token
+        b: Second token
+    
+    Returns:
+        True if the tokens are identical
+    """
+    return a == b
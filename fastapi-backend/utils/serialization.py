@@ -0,0 +1,23 @@
+"""
+JSON Serialization Helpers for NEXUS System
+Fast orjson-based encoding for WebSocket payloads
+"""
+from typing import Any
+
+import orjson
+
+# Numpy values can appear in AI engine event data; naive datetimes are UTC
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+
+def dumps(obj: Any) -> str:
+    """
+    Encode an object to a JSON string using orjson
+    
+    Args:
+        obj: JSON-compatible object (datetime, enum and numpy values allowed)
+    
+    Returns:
+        JSON text suitable for WebSocket text frames
+    """
+    return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()